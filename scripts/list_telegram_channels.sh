@@ -2,10 +2,11 @@
 set -euo pipefail
 
 # List all Telegram dialogs/channels for a configured account
-# Usage: scripts/list_telegram_channels.sh [ACCOUNT_ID]
-# Example: scripts/list_telegram_channels.sh ta01
+# Usage: scripts/list_telegram_channels.sh [ACCOUNT_ID] [--limit N] [--no-archived] [--filter TYPE]
+# Example: scripts/list_telegram_channels.sh ta01 --filter channel
 
 ACCOUNT_ID="${1:-ta01}"
+shift $(( $# > 0 ? 1 : 0 ))
 
 ROOT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")/.." && pwd)"
 cd "$ROOT_DIR"
@@ -45,5 +46,5 @@ docker compose run --rm \
   -e TELEGRAM_SESSION_DIR="${TELEGRAM_SESSION_DIR}" \
   -v "${SESSION_DIR}:${TELEGRAM_SESSION_DIR}" \
   telegram-source \
-  python -m app.list_dialogs
+  python -m app.list_dialogs "$@"
 
@@ -1,7 +1,8 @@
 """Configuration for pocketoption-bot service."""
 
+import json
 import os
-from typing import Optional
+from typing import Dict, Optional
 
 from pydantic import BaseModel, Field
 
@@ -13,6 +14,7 @@ class PocketOptionBotConfig(BaseModel):
     base_stake: float = Field(default=1.0, description="Base stake amount per trade")
     max_stake_per_trade: Optional[float] = Field(default=None, description="Maximum stake per trade (clamp if exceeded)")
     account_type: str = Field(default="DEMO", description="Account type: DEMO or LIVE")
+    max_batch_size: int = Field(default=16, description="Maximum number of signals accepted by one /place_trade_batch request; keep telegram-source's POCKETOPTION_BOT_BATCH_MAX at or below it")
     
     # UI automation settings
     ui_enabled: bool = Field(default=False, description="Enable UI automation")
@@ -20,6 +22,7 @@ class PocketOptionBotConfig(BaseModel):
     username: Optional[str] = Field(default=None, description="PocketOption username")
     password: Optional[str] = Field(default=None, description="PocketOption password")
     headless: bool = Field(default=True, description="Run browser in headless mode")
+    block_resources: bool = Field(default=True, description="Abort image/font/media requests on the trading page")
     
     # UI selectors (all optional, configured via env)
     selector_username: Optional[str] = Field(default=None, description="CSS selector for username input")
@@ -29,6 +32,10 @@ class PocketOptionBotConfig(BaseModel):
     
     # Login flow settings
     login_manual_wait_seconds: int = Field(default=45, description="Max seconds to wait for manual captcha/login after clicking the login button")
+    auth_state_path: Optional[str] = Field(default=None, description="File to persist the authenticated browser storage state (cookies/localStorage) across runs")
+    auth_state_max_age_hours: float = Field(default=12.0, description="Ignore a persisted auth state file older than this many hours")
+    user_data_dir: Optional[str] = Field(default=None, description="Chromium profile directory; when set, a persistent browser context is used")
+    cdp_endpoint: Optional[str] = Field(default=None, description="CDP endpoint of an already running Chromium to attach to instead of launching one")
     
     # Trading URLs
     trading_url_demo: str = Field(default="https://pocketoption.com/en/cabinet/demo-quick-high-low/", description="Demo trading page URL")
@@ -42,6 +49,7 @@ class PocketOptionBotConfig(BaseModel):
     selector_direction_down: Optional[str] = Field(default=None, description="CSS selector for DOWN/LOWER direction button")
     selector_stake_field: Optional[str] = Field(default=None, description="CSS selector for stake/amount input field")
     selector_place_trade_button: Optional[str] = Field(default=None, description="CSS selector for place trade button")
+    duration_presets: Optional[Dict[int, str]] = Field(default=None, description="Extra/overriding duration (minutes) -> preset label mapping, e.g. {\"3\": \"M3\"}")
 
     @classmethod
     def from_env(cls) -> "PocketOptionBotConfig":
@@ -52,6 +60,7 @@ class PocketOptionBotConfig(BaseModel):
         max_stake_str = os.getenv("POCKETOPTION_MAX_STAKE_PER_TRADE")
         max_stake = float(max_stake_str) if max_stake_str else None
         account_type = os.getenv("POCKETOPTION_ACCOUNT_TYPE", "DEMO").upper()
+        max_batch_size = int(os.getenv("POCKETOPTION_MAX_BATCH_SIZE", "16"))
         
         # UI automation settings
         ui_enabled = os.getenv("POCKETOPTION_UI_ENABLED", "false").lower() in ("true", "1", "yes")
@@ -59,6 +68,7 @@ class PocketOptionBotConfig(BaseModel):
         username = os.getenv("POCKETOPTION_USERNAME")
         password = os.getenv("POCKETOPTION_PASSWORD")
         headless = os.getenv("POCKETOPTION_HEADLESS", "true").lower() in ("true", "1", "yes")
+        block_resources = os.getenv("POCKETOPTION_BLOCK_RESOURCES", "true").lower() in ("true", "1", "yes")
         
         # UI selectors
         selector_username = os.getenv("POCKETOPTION_SELECTOR_USERNAME")
@@ -68,6 +78,10 @@ class PocketOptionBotConfig(BaseModel):
         
         # Login flow settings
         login_manual_wait_seconds = int(os.getenv("POCKETOPTION_LOGIN_MANUAL_WAIT_SECONDS", "45"))
+        auth_state_path = os.getenv("POCKETOPTION_AUTH_STATE_PATH")
+        auth_state_max_age_hours = float(os.getenv("POCKETOPTION_AUTH_STATE_MAX_AGE_HOURS", "12"))
+        user_data_dir = os.getenv("POCKETOPTION_USER_DATA_DIR")
+        cdp_endpoint = os.getenv("POCKETOPTION_CDP_ENDPOINT")
         
         # Trading URLs
         trading_url_demo = os.getenv("POCKETOPTION_TRADING_URL_DEMO", "https://pocketoption.com/en/cabinet/demo-quick-high-low/")
@@ -81,6 +95,8 @@ class PocketOptionBotConfig(BaseModel):
         selector_direction_down = os.getenv("POCKETOPTION_SELECTOR_DIRECTION_DOWN")
         selector_stake_field = os.getenv("POCKETOPTION_SELECTOR_STAKE_FIELD")
         selector_place_trade_button = os.getenv("POCKETOPTION_SELECTOR_PLACE_TRADE_BUTTON")
+        duration_presets_str = os.getenv("POCKETOPTION_DURATION_PRESETS")
+        duration_presets = json.loads(duration_presets_str) if duration_presets_str else None
 
         return cls(
             enabled=enabled,
@@ -88,16 +104,22 @@ class PocketOptionBotConfig(BaseModel):
             base_stake=base_stake,
             max_stake_per_trade=max_stake,
             account_type=account_type,
+            max_batch_size=max_batch_size,
             ui_enabled=ui_enabled,
             login_url=login_url,
             username=username,
             password=password,
             headless=headless,
+            block_resources=block_resources,
             selector_username=selector_username,
             selector_password=selector_password,
             selector_login_button=selector_login_button,
             selector_trading_root=selector_trading_root,
             login_manual_wait_seconds=login_manual_wait_seconds,
+            auth_state_path=auth_state_path,
+            auth_state_max_age_hours=auth_state_max_age_hours,
+            user_data_dir=user_data_dir,
+            cdp_endpoint=cdp_endpoint,
             trading_url_demo=trading_url_demo,
             trading_url_live=trading_url_live,
             use_demo=use_demo,
@@ -107,6 +129,7 @@ class PocketOptionBotConfig(BaseModel):
             selector_direction_down=selector_direction_down,
             selector_stake_field=selector_stake_field,
             selector_place_trade_button=selector_place_trade_button,
+            duration_presets=duration_presets,
         )
 
 
@@ -1,8 +1,18 @@
 """Environment variable loader for local CLI scripts."""
 
 import os
+import re
 from pathlib import Path
-from typing import Optional
+from typing import Dict, Optional
+
+# KEY=value, KEY="value" or KEY='value'; blank lines, comments and lines
+# without '=' do not match. Values are taken verbatim (no inline comments).
+_ENV_LINE_RE = re.compile(
+    r"""^\s*(?P<key>[^#=\s][^=]*?)\s*=\s*(?:"(?P<dq>.*)"|'(?P<sq>.*)'|(?P<bare>.*?))\s*$"""
+)
+
+# .env files already applied in this process, keyed by filename
+_LOADED: Dict[str, Path] = {}
 
 
 def load_local_env(env_filename: str = ".env") -> Optional[Path]:
@@ -13,12 +23,18 @@ def load_local_env(env_filename: str = ".env") -> Optional[Path]:
     This is primarily for local CLI usage (e.g., on Windows).
     Docker / prod still rely on their own env injection.
 
+    Each file is parsed at most once per process; later calls return the
+    cached path.
+
     Args:
         env_filename: Name of the .env file (default: ".env")
 
     Returns:
         Path to the loaded .env file if found, None otherwise
     """
+    if env_filename in _LOADED:
+        return _LOADED[env_filename]
+
     try:
         # env_loader.py is at:
         # <repo_root>/telegram/pocketoption-bot/app/env_loader.py
@@ -31,21 +47,24 @@ def load_local_env(env_filename: str = ".env") -> Optional[Path]:
         return None
 
     try:
-        for line in env_path.read_text(encoding="utf-8").splitlines():
-            line = line.strip()
-            if not line or line.startswith("#") or "=" not in line:
-                continue
-            key, value = line.split("=", 1)
-            key = key.strip()
-            value = value.strip().strip('"').strip("'")
-            if not key:
-                continue
-            # Do not override existing env vars; Docker / shell should win.
-            if key not in os.environ:
-                os.environ[key] = value
+        with env_path.open("r", encoding="utf-8") as f:
+            for line in f:
+                match = _ENV_LINE_RE.match(line)
+                if match is None:
+                    continue
+                key = match.group("key")
+                value = match.group("dq")
+                if value is None:
+                    value = match.group("sq")
+                if value is None:
+                    value = match.group("bare")
+                # Do not override existing env vars; Docker / shell should win.
+                if key not in os.environ:
+                    os.environ[key] = value
     except Exception:
         # Fail silently here; any missing keys will be handled by settings validation.
         return None
 
+    _LOADED[env_filename] = env_path
     return env_path
 
@@ -1,5 +1,7 @@
 """Main entry point for pocketoption-bot HTTP API service."""
 
+from typing import List
+
 from fastapi import FastAPI, HTTPException, status
 from fastapi.responses import JSONResponse
 
@@ -26,17 +28,8 @@ async def health():
     }
 
 
-@app.post("/place_trade")
-async def place_trade(signal: PocketOptionSignal) -> TradeResult:
-    """
-    Place a PocketOption trade based on a signal.
-    
-    Args:
-        signal: PocketOptionSignal from telegram-source
-        
-    Returns:
-        TradeResult indicating the outcome
-    """
+def _execute_signal(signal: PocketOptionSignal) -> TradeResult:
+    """Execute one signal, logging the request and its outcome."""
     logger.info(
         "Received trade request",
         extra={
@@ -52,7 +45,6 @@ async def place_trade(signal: PocketOptionSignal) -> TradeResult:
     # Execute the trade
     result = executor.execute(signal)
     
-    # Map result to HTTP response
     if result.status == "error":
         logger.error(
             "Trade execution error",
@@ -61,25 +53,73 @@ async def place_trade(signal: PocketOptionSignal) -> TradeResult:
                 "signal_type": signal.signal_type.value,
             }
         )
+    else:
+        logger.info(
+            "Trade request processed",
+            extra={
+                "status": result.status,
+                "reason": result.reason,
+                "dry_run": result.dry_run,
+                "signal_type": signal.signal_type.value,
+            }
+        )
+    return result
+
+
+@app.post("/place_trade")
+def place_trade(signal: PocketOptionSignal) -> TradeResult:
+    """
+    Place a PocketOption trade based on a signal.
+    
+    A plain def, like /place_trade_batch: the sync UI driver runs its own
+    event loop, which cannot be started from the server's.
+    
+    Args:
+        signal: PocketOptionSignal from telegram-source
+        
+    Returns:
+        TradeResult indicating the outcome
+    """
+    result = _execute_signal(signal)
+    
+    # Map result to HTTP response
+    if result.status == "error":
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=result.reason or "Trade execution error",
         )
     
     # Return successful result (accepted or skipped)
-    logger.info(
-        "Trade request processed",
-        extra={
-            "status": result.status,
-            "reason": result.reason,
-            "dry_run": result.dry_run,
-            "signal_type": signal.signal_type.value,
-        }
-    )
-    
     return result
 
 
+@app.post("/place_trade_batch")
+def place_trade_batch(signals: List[PocketOptionSignal]) -> List[TradeResult]:
+    """
+    Place several PocketOption trades, in order, from one request.
+    
+    Unlike /place_trade, execution errors do not fail the request; each
+    signal gets its own TradeResult (status "error" on failure). A plain
+    def, so FastAPI runs the blocking executor (and UI automation) in its
+    threadpool instead of on the event loop.
+    
+    Args:
+        signals: PocketOptionSignals from telegram-source, in arrival order
+        
+    Returns:
+        One TradeResult per signal
+        
+    Raises:
+        HTTPException: 413 if more than settings.max_batch_size signals are sent
+    """
+    if len(signals) > settings.max_batch_size:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Batch of {len(signals)} signals exceeds the limit of {settings.max_batch_size}",
+        )
+    return [_execute_signal(signal) for signal in signals]
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run("app.main:app", host="0.0.0.0", port=8080, reload=True)
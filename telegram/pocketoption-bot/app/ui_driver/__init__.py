@@ -1,6 +1,6 @@
 """UI driver package for PocketOption automation."""
 
+from .async_playwright_driver import AsyncPocketOptionUIDriver
 from .playwright_driver import PocketOptionUIDriver
 
-__all__ = ["PocketOptionUIDriver"]
-
+__all__ = ["AsyncPocketOptionUIDriver", "PocketOptionUIDriver"]
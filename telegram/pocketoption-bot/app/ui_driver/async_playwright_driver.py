@@ -0,0 +1,611 @@
+"""Async Playwright-based UI driver for PocketOption automation."""
+
+import asyncio
+import json
+import logging
+import os
+import re
+import tempfile
+import time
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional, Tuple, TYPE_CHECKING, Union
+
+# Guarded import: Playwright is optional
+try:
+    from playwright.async_api import async_playwright, expect, Browser, BrowserContext, Locator, Page, Playwright
+    ASYNC_PLAYWRIGHT = async_playwright
+except ImportError:
+    ASYNC_PLAYWRIGHT = None
+    expect = None
+    # For type checking when Playwright is not installed
+    if TYPE_CHECKING:
+        from playwright.async_api import Browser, BrowserContext, Locator, Page, Playwright
+    else:
+        # Create dummy types for runtime when Playwright is not available
+        Browser = BrowserContext = Locator = Page = Playwright = None  # type: ignore
+
+from app.config import PocketOptionBotConfig
+from app.logging_config import get_logger
+from app.models.pocketoption import PocketOptionDirection
+
+logger = get_logger("ui-driver")
+
+# Default duration (minutes) -> preset label shown in the PocketOption duration panel.
+# Can be extended/overridden per deployment via POCKETOPTION_DURATION_PRESETS.
+DURATION_PRESETS: Dict[int, str] = {1: "M1", 5: "M5", 15: "M15", 30: "M30"}
+
+# Chromium flags trimming background work for a scripted, single-purpose browser
+CHROMIUM_ARGS = [
+    "--disable-dev-shm-usage",
+    "--disable-gpu",
+    "--disable-background-networking",
+    "--disable-extensions",
+    "--disable-features=TranslateUI",
+    "--mute-audio",
+]
+
+# Resource types aborted on the trading page when settings.block_resources is set
+BLOCKED_RESOURCE_TYPES = frozenset({"image", "font", "media"})
+
+
+async def _route_block_heavy_resources(route) -> None:
+    """Playwright route handler that aborts heavy, non-functional resources."""
+    if route.request.resource_type in BLOCKED_RESOURCE_TYPES:
+        await route.abort()
+    else:
+        await route.continue_()
+
+
+# Sets several inputs in a single evaluate() round-trip. Uses the native value
+# setter + bubbling input/change events so React-controlled inputs pick it up.
+# Returns false (nothing changed) if any selector does not match.
+FILL_INPUTS_JS = """
+(pairs) => {
+    const elements = pairs.map(([selector]) => document.querySelector(selector));
+    if (elements.some((el) => !el)) {
+        return false;
+    }
+    const setter = Object.getOwnPropertyDescriptor(window.HTMLInputElement.prototype, "value").set;
+    elements.forEach((el, i) => {
+        setter.call(el, pairs[i][1]);
+        el.dispatchEvent(new Event("input", { bubbles: true }));
+        el.dispatchEvent(new Event("change", { bubbles: true }));
+    });
+    return true;
+}
+"""
+
+
+# BUY/SELL button used for each direction
+UP_DIRECTIONS = (PocketOptionDirection.UP, PocketOptionDirection.CALL, PocketOptionDirection.HIGHER)
+DOWN_DIRECTIONS = (PocketOptionDirection.DOWN, PocketOptionDirection.PUT, PocketOptionDirection.LOWER)
+
+# (env var, settings attribute) pairs required by each flow
+LOGIN_REQUIRED = (
+    ("POCKETOPTION_LOGIN_URL", "login_url"),
+    ("POCKETOPTION_USERNAME", "username"),
+    ("POCKETOPTION_PASSWORD", "password"),
+    ("POCKETOPTION_SELECTOR_USERNAME", "selector_username"),
+    ("POCKETOPTION_SELECTOR_PASSWORD", "selector_password"),
+    ("POCKETOPTION_SELECTOR_LOGIN_BUTTON", "selector_login_button"),
+)
+# BUY/SELL buttons act as both direction and place-trade
+TRADE_REQUIRED = (
+    ("POCKETOPTION_SELECTOR_ASSET_FIELD", "selector_asset_field"),
+    ("POCKETOPTION_SELECTOR_DURATION_FIELD", "selector_duration_field"),
+    ("POCKETOPTION_SELECTOR_STAKE_FIELD", "selector_stake_field"),
+    ("POCKETOPTION_SELECTOR_DIRECTION_UP", "selector_direction_up"),
+    ("POCKETOPTION_SELECTOR_DIRECTION_DOWN", "selector_direction_down"),
+)
+
+
+def _stake_pattern(value: str) -> "re.Pattern[str]":
+    """Match the stake `value` as the amount field may reformat it ("1.0" shown as "1" or "1.00")."""
+    whole, _, fraction = value.partition(".")
+    fraction = fraction.rstrip("0")
+    if fraction:
+        return re.compile(rf"^{re.escape(whole)}\.{re.escape(fraction)}0*$")
+    return re.compile(rf"^{re.escape(whole)}(\.0*)?$")
+
+
+def missing_settings(settings: PocketOptionBotConfig, required: Tuple[Tuple[str, str], ...]) -> Tuple[str, ...]:
+    """Return the env var names of the `required` (env var, attribute) pairs left unset."""
+    return tuple(env for env, attr in required if not getattr(settings, attr))
+
+
+def load_auth_state(settings: PocketOptionBotConfig) -> Optional[dict]:
+    """
+    Load a previously persisted auth storage state.
+
+    Returns None if no auth_state_path is configured, the file is missing,
+    unreadable, or older than settings.auth_state_max_age_hours.
+    """
+    path = settings.auth_state_path
+    if not path or not Path(path).is_file():
+        return None
+    age_hours = (time.time() - Path(path).stat().st_mtime) / 3600
+    if age_hours > settings.auth_state_max_age_hours:
+        logger.info(
+            "Persisted auth storage state is stale, ignoring",
+            extra={"path": path, "age_hours": round(age_hours, 1)},
+        )
+        return None
+    try:
+        with open(path, encoding="utf-8") as f:
+            state = json.load(f)
+    except Exception as e:
+        logger.warning("Failed to load persisted auth storage state: %s", e)
+        return None
+    logger.info("Loaded persisted auth storage state", extra={"path": path})
+    return state
+
+
+def save_auth_state(settings: PocketOptionBotConfig, state: dict) -> None:
+    """
+    Persist an auth storage state to settings.auth_state_path (no-op if unset).
+
+    The state holds session cookies, so it is written owner-only (0600) to a
+    temp file in the same directory and atomically moved into place; readers
+    never see a partial file.
+    """
+    path = settings.auth_state_path
+    if not path:
+        return
+    try:
+        target = Path(path)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        # mkstemp creates the file with mode 0600
+        fd, tmp_path = tempfile.mkstemp(dir=target.parent, prefix=f".{target.name}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(state, f)
+            os.replace(tmp_path, target)
+        except BaseException:
+            Path(tmp_path).unlink(missing_ok=True)
+            raise
+        logger.info("Persisted auth storage state", extra={"path": path})
+    except Exception as e:
+        logger.warning("Failed to persist storage state: %s", e)
+
+
+class AsyncPocketOptionUIDriver:
+    """
+    Async Playwright UI driver sharing one browser across concurrent trades.
+
+    One Playwright instance and one browser are kept for the driver lifetime;
+    every flow runs in its own page, so several trade flows can progress
+    during each other's UI waits on a single event loop. The sync
+    PocketOptionUIDriver runs these same flows via asyncio.run().
+
+    Authentication is taken from a storage state captured by login(), from
+    ``settings.auth_state_path``, or from the browser profile itself
+    (``settings.user_data_dir`` / ``settings.cdp_endpoint``).
+    """
+
+    def __init__(
+        self,
+        settings: PocketOptionBotConfig,
+        storage_state: Optional[Union[dict, str]] = None,
+    ):
+        """
+        Initialize the async UI driver.
+
+        Args:
+            settings: PocketOption bot configuration
+            storage_state: Authenticated storage state (dict or file path) to open
+                flow contexts with; defaults to the persisted auth state file
+
+        Raises:
+            RuntimeError: If Playwright is not installed
+        """
+        if ASYNC_PLAYWRIGHT is None:
+            raise RuntimeError(
+                "Playwright is not installed. Install 'playwright' and run 'playwright install'."
+            )
+
+        if storage_state is None:
+            storage_state = load_auth_state(settings)
+
+        self.settings = settings
+        self.storage_state = storage_state
+        # Effective (demo/live) trading URL, resolved once
+        self._trading_url = settings.trading_url
+        self.playwright: Optional[Playwright] = None
+        self.browser: Optional[Browser] = None
+        # Persistent profile context (settings.user_data_dir), shared by all flows
+        self._profile_context: Optional[BrowserContext] = None
+        # Serializes start() so concurrent first trades launch a single browser
+        self._start_lock = asyncio.Lock()
+        # Settings are immutable for the driver lifetime: validate once here,
+        # report from the flow that actually needs them.
+        self._missing_login_settings = missing_settings(settings, LOGIN_REQUIRED)
+        self._missing_trade_selectors = missing_settings(settings, TRADE_REQUIRED)
+        self._duration_presets: Dict[int, str] = {
+            **DURATION_PRESETS,
+            **(settings.duration_presets or {}),
+        }
+
+    async def start(self, playwright: Optional["Playwright"] = None) -> None:
+        """
+        Start Playwright and launch (or attach to) the shared browser (idempotent).
+
+        With settings.cdp_endpoint set, an already running Chromium (see
+        app.ui_driver.browser_daemon) is attached to instead of launching one.
+        With settings.user_data_dir set, a persistent profile is launched so
+        cookies/localStorage and the HTTP cache survive process restarts.
+        Otherwise a fresh browser is launched.
+
+        Args:
+            playwright: An already started Playwright instance to take over
+                (e.g. started while settings were still loading); stopped by close()
+        """
+        async with self._start_lock:
+            if self.browser is not None or self._profile_context is not None:
+                return
+            self.playwright = self.playwright or playwright or await ASYNC_PLAYWRIGHT().start()
+            chromium = self.playwright.chromium
+            if self.settings.cdp_endpoint:
+                logger.info("Attaching to running browser", extra={"cdp_endpoint": self.settings.cdp_endpoint})
+                self.browser = await chromium.connect_over_cdp(self.settings.cdp_endpoint)
+            elif self.settings.user_data_dir:
+                logger.info("Launching browser profile", extra={"user_data_dir": self.settings.user_data_dir})
+                self._profile_context = await chromium.launch_persistent_context(
+                    user_data_dir=self.settings.user_data_dir,
+                    headless=self.settings.headless,
+                    args=CHROMIUM_ARGS,
+                )
+            else:
+                logger.info("Launching browser", extra={"headless": self.settings.headless})
+                self.browser = await chromium.launch(headless=self.settings.headless, args=CHROMIUM_ARGS)
+
+    @staticmethod
+    async def _safe_close(obj) -> None:
+        """Close a Playwright page/context/browser, ignoring (but logging) failures."""
+        if obj is None:
+            return
+        try:
+            await obj.close()
+        except Exception:
+            logger.debug("Close failed for %s", type(obj).__name__, exc_info=True)
+
+    async def close(self) -> None:
+        """
+        Close the shared browser and stop Playwright.
+
+        Over CDP the browser belongs to the daemon: closing it only disconnects
+        (dropping the contexts created over the connection).
+        """
+        await self._safe_close(self._profile_context)
+        self._profile_context = None
+        await self._safe_close(self.browser)
+        self.browser = None
+        if self.playwright is not None:
+            try:
+                await self.playwright.stop()
+            except Exception:
+                logger.debug("Playwright stop failed", exc_info=True)
+            self.playwright = None
+
+    async def __aenter__(self) -> "AsyncPocketOptionUIDriver":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    @asynccontextmanager
+    async def _flow_page(self, block_resources: bool = False) -> AsyncIterator["Page"]:
+        """
+        Yield a page for one flow, closing it (and any context opened for it) afterwards.
+
+        The persistent profile context, and the daemon's profile context over
+        CDP when there is no storage state, are shared and left open; otherwise
+        a new context seeded with the storage state, if any, is opened.
+        Resource blocking is routed on the page, so a shared context is never
+        modified.
+        """
+        owned_context: Optional[BrowserContext] = None
+        if self._profile_context is not None:
+            context = self._profile_context
+        elif self.settings.cdp_endpoint and self.storage_state is None and self.browser.contexts:
+            context = self.browser.contexts[0]
+        elif self.storage_state is not None:
+            context = owned_context = await self.browser.new_context(storage_state=self.storage_state)
+        else:
+            context = owned_context = await self.browser.new_context()
+
+        page: Optional[Page] = None
+        try:
+            page = await context.new_page()
+            if block_resources:
+                await page.route("**/*", _route_block_heavy_resources)
+            yield page
+        finally:
+            await self._safe_close(page)
+            await self._safe_close(owned_context)
+
+    @staticmethod
+    async def _fill_stake(stake_locator: "Locator", value: str) -> None:
+        """
+        Set the stake input, falling back to per-key typing if needed.
+
+        The fast `fill` path is tried first and verified; the React-controlled
+        amount field sometimes drops programmatic values, in which case the
+        value is typed key by key. The shown value is compared numerically,
+        since the field may reformat it.
+
+        Raises:
+            AssertionError: If the field does not show the stake after typing
+        """
+        expected = _stake_pattern(value)
+        await stake_locator.fill(value)
+        try:
+            await expect(stake_locator).to_have_value(expected, timeout=1000)
+            return
+        except AssertionError:
+            logger.info("Stake fill not applied, retrying with key presses", extra={"stake": value})
+        await stake_locator.fill("")
+        await stake_locator.press_sequentially(value, delay=10)
+        await expect(stake_locator).to_have_value(expected, timeout=1000)
+
+    async def _capture_auth_state(self, page: "Page", persist: bool = True) -> None:
+        """
+        Capture the auth storage state of the page's context for later flows.
+
+        Args:
+            page: Logged-in page
+            persist: Also write it to settings.auth_state_path; only done after an
+                actual login, since rewriting on reuse would refresh the file
+                mtime and keep the state from ever expiring
+        """
+        try:
+            self.storage_state = await page.context.storage_state()
+            logger.info("Captured auth storage state for reuse")
+        except Exception as e:
+            logger.warning("Failed to capture storage state: %s", e)
+            return
+        if persist:
+            save_auth_state(self.settings, self.storage_state)
+
+    def _has_session_source(self) -> bool:
+        """Whether a flow may already be logged in (stored state or a reused browser profile)."""
+        return bool(
+            self.storage_state is not None
+            or self.settings.user_data_dir
+            or self.settings.cdp_endpoint
+        )
+
+    async def needs_login(self, page: "Page") -> bool:
+        """
+        Check whether the stored auth state still yields a logged-in trading page.
+
+        Navigates to the trading URL and looks for the trading page landmark.
+        """
+        if not self._has_session_source():
+            return True
+        try:
+            await page.goto(self._trading_url, wait_until="domcontentloaded", timeout=60000)
+        except Exception as e:
+            logger.info("Trading page not reachable with stored auth state: %s", e)
+            return True
+        return not await self._is_trading_page(page)
+
+    async def _is_trading_page(self, page: "Page") -> bool:
+        """
+        Heuristic to detect whether we are on the main trading page.
+
+        We consider the user 'logged in' if either:
+        - the URL contains '/cabinet', or
+        - the configured trading root selector is visible.
+        """
+        if "/cabinet" in page.url:
+            return True
+        try:
+            return await page.locator(self.settings.selector_trading_root).first.is_visible(timeout=2000)
+        except Exception:
+            return False
+
+    async def login(self) -> None:
+        """
+        Log in to PocketOption and keep the resulting storage state for later flows.
+
+        Skips the login form if the stored auth state (or browser profile)
+        still reaches the trading page. The state captured after an actual
+        login is persisted to settings.auth_state_path when configured.
+
+        Raises:
+            RuntimeError: If required settings are missing or login fails
+        """
+        if self._missing_login_settings:
+            error_msg = f"Missing required UI settings: {', '.join(self._missing_login_settings)}"
+            logger.error(error_msg)
+            raise RuntimeError(error_msg)
+
+        logger.info("Starting PocketOption login", extra={"login_url": self.settings.login_url})
+        await self.start()
+        try:
+            async with self._flow_page() as page:
+                if not await self.needs_login(page):
+                    logger.info("Stored auth state is still valid; skipping login form")
+                    await self._capture_auth_state(page, persist=False)
+                    return
+
+                # Navigate to login page with tolerant wait strategy
+                logger.info("Navigating to login page", extra={"url": self.settings.login_url})
+                await page.goto(self.settings.login_url, wait_until="domcontentloaded", timeout=60000)
+                await page.wait_for_timeout(1000)  # Give page time to settle
+                # SPAs / analytics can keep the network busy; don't fail if networkidle times out
+                try:
+                    await page.wait_for_load_state("networkidle", timeout=5000)
+                except Exception:
+                    logger.info("networkidle not reached, continuing anyway")
+
+                # Fill username + password in one round-trip; fall back to per-field fill
+                filled = await page.evaluate(
+                    FILL_INPUTS_JS,
+                    [
+                        [self.settings.selector_username, self.settings.username],
+                        [self.settings.selector_password, self.settings.password],
+                    ],
+                )
+                if not filled:
+                    logger.info("Batched fill failed, filling fields individually")
+                    await page.fill(self.settings.selector_username, self.settings.username)
+                    await page.fill(self.settings.selector_password, self.settings.password)
+
+                logger.info("Clicking login button", extra={"selector": self.settings.selector_login_button})
+                await page.click(self.settings.selector_login_button)
+                await page.wait_for_timeout(2000)
+
+                # Not yet on trading page: likely captcha/manual step required
+                max_wait = self.settings.login_manual_wait_seconds
+                waited = 0
+                step = 5
+                while not await self._is_trading_page(page):
+                    if waited >= max_wait:
+                        logger.error(
+                            "Login failed - still on login page after %s seconds manual wait",
+                            max_wait,
+                        )
+                        raise RuntimeError(
+                            f"PocketOption UI login failed: still on login page after {max_wait} seconds"
+                        )
+                    if waited == 0:
+                        logger.warning(
+                            "Login requires manual intervention - waiting up to %s seconds...",
+                            max_wait,
+                        )
+                    await page.wait_for_timeout(step * 1000)
+                    waited += step
+
+                logger.info("Login detected as successful (trading page visible)")
+                await self._capture_auth_state(page)
+        except RuntimeError:
+            raise
+        except Exception as e:
+            logger.error("PocketOption UI login failed", extra={"error": str(e)}, exc_info=True)
+            raise RuntimeError(f"PocketOption UI login failed: {e}") from e
+
+    async def place_entry_trade(
+        self,
+        asset: str,
+        duration_minutes: int,
+        direction: PocketOptionDirection,
+        stake: float,
+    ) -> None:
+        """
+        Place a single ENTRY trade on PocketOption UI in its own page.
+
+        Args:
+            asset: Asset symbol (e.g., "GBP/USD OTC")
+            duration_minutes: Trade duration in minutes
+            direction: Trade direction (UP/DOWN)
+            stake: Trade stake amount
+
+        Raises:
+            RuntimeError: If required selectors are missing or trade execution fails
+        """
+        if self._missing_trade_selectors:
+            error_msg = f"Missing required trading selectors: {', '.join(self._missing_trade_selectors)}"
+            logger.error(error_msg)
+            raise RuntimeError(error_msg)
+
+        # BUY/SELL buttons act as both direction and place-trade
+        if direction in UP_DIRECTIONS:
+            direction_selector = self.settings.selector_direction_up
+        elif direction in DOWN_DIRECTIONS:
+            direction_selector = self.settings.selector_direction_down
+        else:
+            raise RuntimeError(f"Unsupported direction: {direction}")
+
+        trade_extra = {
+            "asset": asset,
+            "duration_minutes": duration_minutes,
+            "direction": direction.value,
+            "stake": stake,
+        }
+        logger.info("Placing ENTRY trade via UI", extra=trade_extra)
+        # Per-step progress is DEBUG only; entry/exit stay at INFO
+        debug = logger.isEnabledFor(logging.DEBUG)
+        if not self._has_session_source():
+            logger.warning(
+                "No auth storage state available; opening fresh context (may not be logged in)"
+            )
+
+        await self.start()
+        try:
+            async with self._flow_page(block_resources=self.settings.block_resources) as page:
+                if debug:
+                    logger.debug("Navigating to trading page", extra={"url": self._trading_url})
+                await page.goto(self._trading_url, wait_until="domcontentloaded", timeout=60000)
+                await page.wait_for_timeout(1000)  # Give page time to settle
+
+                # Asset selection: open asset panel, search and select by text
+                if debug:
+                    logger.debug("Selecting asset", extra={"asset": asset})
+                await page.wait_for_selector(self.settings.selector_asset_field, timeout=60000)
+                await page.click(self.settings.selector_asset_field)
+                await page.wait_for_timeout(500)  # Wait for asset panel to open
+                # fill focuses the box and waits until it is actionable
+                try:
+                    await page.get_by_placeholder("Search").fill(asset)
+                except Exception:
+                    logger.warning("Could not find search placeholder, attempting alternative search")
+                await page.get_by_text(asset).first.click()
+                await page.wait_for_timeout(500)
+
+                # Duration: open duration panel and select preset (e.g., M5 for 5 minutes)
+                if debug:
+                    logger.debug("Setting duration", extra={"duration_minutes": duration_minutes})
+                await page.wait_for_selector(self.settings.selector_duration_field, timeout=60000)
+                await page.click(self.settings.selector_duration_field)
+                await page.wait_for_timeout(200)
+                label = self._duration_presets.get(duration_minutes)
+                if label:
+                    preset = page.get_by_text(label).first
+                    await preset.wait_for(timeout=10000)
+                    await preset.click()
+                else:
+                    logger.warning(
+                        "Unsupported duration, attempting to proceed without changing",
+                        extra={"duration_minutes": duration_minutes}
+                    )
+                await page.wait_for_timeout(200)
+
+                # Stake
+                if debug:
+                    logger.debug("Setting stake", extra={"stake": stake})
+                await page.wait_for_selector(self.settings.selector_stake_field, timeout=60000)
+                await self._fill_stake(page.locator(self.settings.selector_stake_field), str(stake))
+
+                # Direction & place-trade
+                if debug:
+                    logger.debug("Clicking direction button", extra={"selector": direction_selector})
+                await page.wait_for_selector(direction_selector, timeout=60000)
+                await page.click(direction_selector)
+
+                # Wait for trade confirmation
+                await page.wait_for_timeout(1000)
+
+                logger.info("ENTRY trade placed via UI", extra=trade_extra)
+        except Exception as e:
+            logger.error("Failed to place ENTRY trade via UI", extra={"error": str(e)}, exc_info=True)
+            raise RuntimeError(f"UI trade execution failed: {e}") from e
+
+    async def place_entry_trades(self, trades: Iterable[Dict[str, Any]]) -> List[Optional[BaseException]]:
+        """
+        Place several ENTRY trades concurrently on the shared browser.
+
+        Args:
+            trades: Keyword-argument dicts for place_entry_trade()
+
+        Returns:
+            One entry per trade: None on success, the raised exception otherwise
+        """
+        await self.start()
+        results = await asyncio.gather(
+            *(self.place_entry_trade(**trade) for trade in trades),
+            return_exceptions=True,
+        )
+        return [result if isinstance(result, BaseException) else None for result in results]
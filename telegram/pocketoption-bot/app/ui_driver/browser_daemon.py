@@ -0,0 +1,228 @@
+"""
+Long-lived Chromium for local UI CLI runs.
+
+Starts Playwright's Chromium detached with a remote debugging port so that
+repeated CLI invocations (ui_login_test / ui_entry_test) can attach via
+CDP (POCKETOPTION_CDP_ENDPOINT) instead of launching a browser each time.
+The endpoint file records the endpoint, PID and profile of the started
+browser as JSON; a browser already listening on the port is only reused
+if it matches that record.
+
+Usage:
+    python -m app.ui_driver.browser_daemon [--port 9222] [--user-data-dir DIR]
+"""
+
+import argparse
+import json
+import os
+import stat
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from pathlib import Path
+from typing import Optional
+
+# Guarded import: Playwright is optional (only used to locate its Chromium build)
+try:
+    from playwright.sync_api import sync_playwright
+    SYNC_PLAYWRIGHT = sync_playwright
+except ImportError:
+    SYNC_PLAYWRIGHT = None
+
+from app.logging_config import get_logger
+from app.ui_driver.async_playwright_driver import CHROMIUM_ARGS
+
+logger = get_logger("ui-browser-daemon")
+
+DEFAULT_PORT = 9222
+DEFAULT_USER_DATA_DIR = "/tmp/po-profile"
+DEFAULT_ENDPOINT_FILE = "/tmp/po-cdp-endpoint"
+
+
+def get_ws_endpoint(port: int) -> Optional[str]:
+    """Return the CDP websocket endpoint of a browser listening on `port`, if any."""
+    try:
+        with urllib.request.urlopen(f"http://127.0.0.1:{port}/json/version", timeout=1) as response:
+            return json.load(response).get("webSocketDebuggerUrl")
+    except Exception:
+        return None
+
+
+def _check_owned(path: Path) -> None:
+    """
+    Refuse paths that are symlinks or owned by another user.
+    
+    The defaults live in the shared /tmp, where another local user could
+    pre-create them to read the endpoint or plant a profile.
+    """
+    st = path.lstat()
+    if stat.S_ISLNK(st.st_mode) or st.st_uid != os.getuid():
+        raise RuntimeError(f"Refusing to use {path}: symlink or not owned by the current user")
+
+
+def _ensure_private_dir(path: str) -> None:
+    """Create `path` (mode 0700) or verify an existing one is ours, then restrict it to 0700."""
+    directory = Path(path)
+    try:
+        directory.mkdir(mode=0o700, parents=True)
+    except FileExistsError:
+        _check_owned(directory)
+        if not directory.is_dir():
+            raise RuntimeError(f"Refusing to use {path}: not a directory")
+    directory.chmod(0o700)
+
+
+def _write_private_file(path: str, text: str) -> None:
+    """Atomically write `text` to `path` with mode 0600, refusing a foreign existing file."""
+    target = Path(path)
+    if target.exists() or target.is_symlink():
+        _check_owned(target)
+    # mkstemp creates the file with mode 0600
+    fd, tmp_path = tempfile.mkstemp(dir=target.parent, prefix=f".{target.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(text)
+        os.replace(tmp_path, target)
+    except BaseException:
+        Path(tmp_path).unlink(missing_ok=True)
+        raise
+
+
+def _read_record(endpoint_file: str) -> Optional[dict]:
+    """Return the record a previous start wrote to `endpoint_file`, or None if missing, foreign or invalid."""
+    try:
+        fd = os.open(endpoint_file, os.O_RDONLY | os.O_NOFOLLOW)
+    except OSError:
+        return None
+    with os.fdopen(fd, encoding="utf-8") as f:
+        if os.fstat(f.fileno()).st_uid != os.getuid():
+            return None
+        try:
+            record = json.load(f)
+        except ValueError:
+            return None
+    return record if isinstance(record, dict) else None
+
+
+def _is_own_browser(record: Optional[dict], endpoint: str, user_data_dir: str) -> bool:
+    """
+    Whether `endpoint` is the browser recorded for `user_data_dir` and still runs as this user.
+    
+    The websocket endpoint embeds a per-launch browser id, so another browser
+    bound to the same port never matches the recorded one.
+    """
+    if not record or record.get("endpoint") != endpoint or record.get("user_data_dir") != user_data_dir:
+        return False
+    try:
+        # Signal 0 only checks the process exists and may be signalled by us
+        os.kill(int(record["pid"]), 0)
+    except (KeyError, TypeError, ValueError, OSError):
+        return False
+    return True
+
+
+def start_browser_daemon(
+    port: int = DEFAULT_PORT,
+    user_data_dir: str = DEFAULT_USER_DATA_DIR,
+    endpoint_file: str = DEFAULT_ENDPOINT_FILE,
+    headless: bool = True,
+    startup_timeout: float = 15.0,
+) -> str:
+    """
+    Start (or reuse) a detached Chromium with remote debugging enabled.
+
+    A browser already listening on `port` is reused only if it is the one a
+    previous start recorded in `endpoint_file` for the same profile.
+
+    Args:
+        port: Remote debugging port
+        user_data_dir: Chromium profile directory
+        endpoint_file: File the endpoint, PID and profile are recorded in (JSON)
+        headless: Run Chromium headless
+        startup_timeout: Seconds to wait for the debugging endpoint
+
+    Returns:
+        The CDP websocket endpoint
+
+    Raises:
+        RuntimeError: If Playwright is not installed, Chromium does not come up,
+            the port is taken by a browser this daemon did not start, or the
+            profile dir / endpoint file belongs to another user
+    """
+    user_data_dir = os.path.abspath(user_data_dir)
+    endpoint = get_ws_endpoint(port)
+    if endpoint:
+        if not _is_own_browser(_read_record(endpoint_file), endpoint, user_data_dir):
+            raise RuntimeError(
+                f"Port {port} is in use by a browser not started for {user_data_dir}; "
+                "stop it or pass another --port"
+            )
+        logger.info("Reusing running Chromium", extra={"endpoint": endpoint})
+        return endpoint
+
+    if SYNC_PLAYWRIGHT is None:
+        raise RuntimeError(
+            "Playwright is not installed. Install 'playwright' and run 'playwright install'."
+        )
+    # The profile holds session cookies: keep it private to this user
+    _ensure_private_dir(user_data_dir)
+    with SYNC_PLAYWRIGHT() as playwright:
+        executable = playwright.chromium.executable_path
+
+    args = [
+        executable,
+        f"--remote-debugging-port={port}",
+        f"--user-data-dir={user_data_dir}",
+        *CHROMIUM_ARGS,
+    ]
+    if headless:
+        args.append("--headless=new")
+    logger.info("Starting detached Chromium", extra={"port": port, "user_data_dir": user_data_dir})
+    process = subprocess.Popen(
+        args,
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        start_new_session=True,
+    )
+
+    deadline = time.monotonic() + startup_timeout
+    while endpoint is None and time.monotonic() < deadline:
+        time.sleep(0.2)
+        endpoint = get_ws_endpoint(port)
+    if endpoint is None:
+        raise RuntimeError(f"Chromium did not expose a CDP endpoint on port {port}")
+
+    record = {"endpoint": endpoint, "pid": process.pid, "user_data_dir": user_data_dir}
+    _write_private_file(endpoint_file, json.dumps(record))
+    return endpoint
+
+
+def main() -> int:
+    """CLI entry point: start the daemon and print the endpoint to export."""
+    parser = argparse.ArgumentParser(description="Start a persistent Chromium for UI CLI runs")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--user-data-dir", default=DEFAULT_USER_DATA_DIR)
+    parser.add_argument("--endpoint-file", default=DEFAULT_ENDPOINT_FILE)
+    parser.add_argument("--headed", action="store_true", help="Show the browser window")
+    args = parser.parse_args()
+
+    try:
+        endpoint = start_browser_daemon(
+            port=args.port,
+            user_data_dir=args.user_data_dir,
+            endpoint_file=args.endpoint_file,
+            headless=not args.headed,
+        )
+    except RuntimeError as e:
+        print(f"Failed to start Chromium daemon: {e}", file=sys.stderr)
+        return 1
+
+    print(f"POCKETOPTION_CDP_ENDPOINT={endpoint}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,29 +1,34 @@
-"""Playwright-based UI driver for PocketOption automation."""
+"""Synchronous PocketOption UI driver for the CLI scripts and the trade executor."""
 
-import sys
-from typing import Optional, TYPE_CHECKING
-
-# Guarded import: Playwright is optional
-try:
-    from playwright.sync_api import sync_playwright, Browser, BrowserContext, Page
-    SYNC_PLAYWRIGHT = sync_playwright
-except ImportError:
-    SYNC_PLAYWRIGHT = None
-    # For type checking when Playwright is not installed
-    if TYPE_CHECKING:
-        from playwright.sync_api import Page
-    else:
-        # Create a dummy type for runtime when Playwright is not available
-        Page = None  # type: ignore
+import asyncio
+from typing import Awaitable, Callable, Optional, TypeVar
 
 from app.config import PocketOptionBotConfig
 from app.logging_config import get_logger
+from app.models.pocketoption import PocketOptionDirection
+from app.ui_driver.async_playwright_driver import (
+    ASYNC_PLAYWRIGHT,
+    AsyncPocketOptionUIDriver,
+    load_auth_state,
+)
 
 logger = get_logger("ui-driver")
 
+T = TypeVar("T")
+
 
 class PocketOptionUIDriver:
-    """Playwright-based UI driver for PocketOption automation."""
+    """
+    Playwright-based UI driver for PocketOption automation (sync API).
+    
+    A thin wrapper: every flow runs on AsyncPocketOptionUIDriver inside one
+    top-level asyncio.run(), which launches (or attaches to) the browser for
+    that call and closes it afterwards. The auth storage state captured by a
+    flow is carried over to the next one. Must not be called from a running
+    event loop; async callers use AsyncPocketOptionUIDriver directly.
+    """
+    
+    __slots__ = ("settings", "_auth_storage_state")
     
     def __init__(self, settings: PocketOptionBotConfig):
         """
@@ -33,39 +38,27 @@ class PocketOptionUIDriver:
             settings: PocketOption bot configuration
             
         Raises:
-            RuntimeError: If Playwright is not installed or required settings are missing
+            RuntimeError: If Playwright is not installed
         """
-        if SYNC_PLAYWRIGHT is None:
+        if ASYNC_PLAYWRIGHT is None:
             raise RuntimeError(
                 "Playwright is not installed. Install 'playwright' and run 'playwright install'."
             )
         
         self.settings = settings
-        self.browser: Optional[Browser] = None
-        self.context: Optional[BrowserContext] = None
-        self.page: Optional[Page] = None
-        self._auth_storage_state: Optional[dict] = None
+        self._auth_storage_state: Optional[dict] = load_auth_state(settings)
     
-    def _is_trading_page(self, page: "Page") -> bool:
-        """
-        Heuristic to detect whether we are on the main trading page.
-        
-        We consider the user 'logged in' if either:
-        - the URL contains '/cabinet', or
-        - the configured trading root selector is visible.
-        """
-        try:
-            if "/cabinet" in page.url:
-                return True
-        except Exception:
-            # If URL access fails, fall through and rely on selector
-            pass
-        
-        try:
-            root = page.locator(self.settings.selector_trading_root)
-            return root.first.is_visible(timeout=2000)
-        except Exception:
-            return False
+    def _run(self, flow: Callable[[AsyncPocketOptionUIDriver], Awaitable[T]]) -> T:
+        """Run one flow on a fresh async driver, keeping its auth storage state afterwards."""
+        async def run() -> T:
+            driver = AsyncPocketOptionUIDriver(self.settings, storage_state=self._auth_storage_state)
+            try:
+                return await flow(driver)
+            finally:
+                self._auth_storage_state = driver.storage_state
+                await driver.close()
+        
+        return asyncio.run(run())
     
     def login(self) -> None:
         """
@@ -74,126 +67,7 @@ class PocketOptionUIDriver:
         Raises:
             RuntimeError: If required settings are missing or login fails
         """
-        # Validate required settings
-        required_settings = {
-            "POCKETOPTION_LOGIN_URL": self.settings.login_url,
-            "POCKETOPTION_USERNAME": self.settings.username,
-            "POCKETOPTION_PASSWORD": self.settings.password,
-            "POCKETOPTION_SELECTOR_USERNAME": self.settings.selector_username,
-            "POCKETOPTION_SELECTOR_PASSWORD": self.settings.selector_password,
-            "POCKETOPTION_SELECTOR_LOGIN_BUTTON": self.settings.selector_login_button,
-        }
-        
-        missing = [key for key, value in required_settings.items() if not value]
-        if missing:
-            error_msg = f"Missing required UI settings: {', '.join(missing)}"
-            logger.error(error_msg)
-            raise RuntimeError(error_msg)
-        
-        logger.info("Starting PocketOption login", extra={"login_url": self.settings.login_url})
-        
-        try:
-            with SYNC_PLAYWRIGHT() as playwright:
-                # Launch browser
-                logger.info("Launching browser", extra={"headless": self.settings.headless})
-                self.browser = playwright.chromium.launch(headless=self.settings.headless)
-                
-                # Create context
-                self.context = self.browser.new_context()
-                self.page = self.context.new_page()
-                
-                # Navigate to login page with tolerant wait strategy
-                logger.info("Navigating to login page", extra={"url": self.settings.login_url})
-                self.page.goto(
-                    self.settings.login_url,
-                    wait_until="domcontentloaded",
-                    timeout=60000,
-                )
-                
-                # Give the page a brief moment to settle (SPAs / analytics can keep network busy)
-                logger.info("Waiting for page to settle")
-                self.page.wait_for_timeout(1000)
-                
-                # Optional: try to wait for networkidle with short timeout, but don't fail if it times out
-                try:
-                    self.page.wait_for_load_state("networkidle", timeout=5000)
-                except Exception:
-                    logger.info("networkidle not reached, continuing anyway")
-                
-                # Fill username
-                logger.info("Filling username field", extra={"selector": self.settings.selector_username})
-                self.page.fill(self.settings.selector_username, self.settings.username)
-                
-                # Fill password
-                logger.info("Filling password field", extra={"selector": self.settings.selector_password})
-                self.page.fill(self.settings.selector_password, self.settings.password)
-                
-                # Click login button
-                logger.info("Clicking login button", extra={"selector": self.settings.selector_login_button})
-                self.page.click(self.settings.selector_login_button)
-                
-                # Wait for initial response
-                logger.info("Waiting for login to complete")
-                self.page.wait_for_timeout(2000)
-                
-                # First, quick success check
-                if self._is_trading_page(self.page):
-                    logger.info("Login detected as successful (trading page visible)")
-                    # Capture auth storage state for later reuse
-                    try:
-                        self._auth_storage_state = self.context.storage_state()
-                        logger.info("Captured auth storage state for reuse")
-                    except Exception as e:
-                        logger.warning("Failed to capture storage state: %s", e)
-                    return
-                
-                # Not yet on trading page: likely captcha/manual step required
-                max_wait = self.settings.login_manual_wait_seconds
-                logger.warning(
-                    "Login may have failed or requires manual intervention - still on login page. "
-                    "Waiting up to %s seconds for manual captcha/login...",
-                    max_wait,
-                )
-                
-                waited = 0
-                step = 5
-                
-                while waited < max_wait:
-                    self.page.wait_for_timeout(step * 1000)
-                    waited += step
-                    
-                    if self._is_trading_page(self.page):
-                        logger.info(
-                            "Detected trading page after manual intervention (waited %s seconds)",
-                            waited,
-                        )
-                        # Capture auth storage state for later reuse
-                        try:
-                            self._auth_storage_state = self.context.storage_state()
-                            logger.info("Captured auth storage state for reuse")
-                        except Exception as e:
-                            logger.warning("Failed to capture storage state: %s", e)
-                        return
-                
-                logger.error(
-                    "Login failed - still on login page after %s seconds manual wait",
-                    max_wait,
-                )
-                raise RuntimeError(
-                    f"PocketOption UI login failed: still on login page after {max_wait} seconds"
-                )
-                
-        except RuntimeError:
-            # Re-raise RuntimeError from login failure
-            raise
-        except Exception as e:
-            logger.error("PocketOption UI login failed", extra={"error": str(e)}, exc_info=True)
-            raise RuntimeError(f"PocketOption UI login failed: {e}") from e
-        finally:
-            # Cleanup (only if login failed - on success, browser/page stay open for further use)
-            # Note: For test scripts, we may want to keep browser open even after success
-            # This cleanup is mainly for error cases
-            pass
+        self._run(lambda driver: driver.login())
     
     def prepare_asset(self, asset: str) -> None:
         """
@@ -207,20 +81,21 @@ class PocketOptionUIDriver:
         """
         logger.info("Preparing asset", extra={"asset": asset})
         
-        if not self.settings.selector_asset_field:
+        selector = self.settings.selector_asset_field
+        if not selector:
             logger.warning("POCKETOPTION_SELECTOR_ASSET_FIELD not configured, skipping asset preparation")
             raise RuntimeError("POCKETOPTION_SELECTOR_ASSET_FIELD not configured")
         
         # Note: This assumes browser/page is already initialized (e.g., after login)
         # For now, this is a stub that logs the action
         # Full implementation would use page.fill() or page.select_option() based on DOM structure
-        logger.info("Asset preparation requested", extra={"asset": asset, "selector": self.settings.selector_asset_field})
+        logger.info("Asset preparation requested", extra={"asset": asset, "selector": selector})
     
     def place_entry_trade(
         self,
         asset: str,
         duration_minutes: int,
-        direction: "PocketOptionDirection",
+        direction: PocketOptionDirection,
         stake: float,
     ) -> None:
         """
@@ -235,162 +110,4 @@ class PocketOptionUIDriver:
         Raises:
             RuntimeError: If required selectors are missing or trade execution fails
         """
-        from app.models.pocketoption import PocketOptionDirection
-        
-        logger.info(
-            "Placing ENTRY trade via UI",
-            extra={
-                "asset": asset,
-                "duration_minutes": duration_minutes,
-                "direction": direction.value if direction else None,
-                "stake": stake,
-            }
-        )
-        
-        # Validate required selectors (BUY/SELL buttons act as both direction and place-trade)
-        required_selectors = {
-            "POCKETOPTION_SELECTOR_ASSET_FIELD": self.settings.selector_asset_field,
-            "POCKETOPTION_SELECTOR_DURATION_FIELD": self.settings.selector_duration_field,
-            "POCKETOPTION_SELECTOR_STAKE_FIELD": self.settings.selector_stake_field,
-            "POCKETOPTION_SELECTOR_DIRECTION_UP": self.settings.selector_direction_up,
-            "POCKETOPTION_SELECTOR_DIRECTION_DOWN": self.settings.selector_direction_down,
-        }
-        
-        missing = [key for key, value in required_selectors.items() if not value]
-        if missing:
-            error_msg = f"Missing required trading selectors: {', '.join(missing)}"
-            logger.error(error_msg)
-            raise RuntimeError(error_msg)
-        
-        browser: Optional[Browser] = None
-        context: Optional[BrowserContext] = None
-        page: Optional[Page] = None
-        
-        try:
-            with SYNC_PLAYWRIGHT() as playwright:
-                # Launch browser
-                logger.info("Launching browser for trade execution", extra={"headless": self.settings.headless})
-                browser = playwright.chromium.launch(headless=self.settings.headless)
-                
-                # Create context with stored auth state if available
-                if self._auth_storage_state is not None:
-                    logger.info("Using stored auth storage state for trading context")
-                    context = browser.new_context(storage_state=self._auth_storage_state)
-                else:
-                    logger.warning(
-                        "No auth storage state available; opening fresh context (may not be logged in)"
-                    )
-                    context = browser.new_context()
-                
-                page = context.new_page()
-                
-                # Navigate to trading page using configured trading URL
-                trading_url = self.settings.trading_url
-                logger.info("Navigating to trading page", extra={"url": trading_url})
-                page.goto(
-                    trading_url,
-                    wait_until="domcontentloaded",
-                    timeout=60000,
-                )
-                page.wait_for_timeout(1000)  # Give page time to settle
-                
-                # Asset selection: click asset field to open panel, then search and select
-                logger.info("Selecting asset", extra={"asset": asset, "selector": self.settings.selector_asset_field})
-                page.wait_for_selector(self.settings.selector_asset_field, timeout=60000)
-                page.click(self.settings.selector_asset_field)
-                page.wait_for_timeout(500)  # Wait for asset panel to open
-                
-                # Search for asset using placeholder or generic search
-                try:
-                    search_locator = page.get_by_placeholder("Search")
-                    search_locator.click()
-                    search_locator.fill(asset)
-                    page.wait_for_timeout(300)
-                except Exception:
-                    # Fallback: try to find search input by other means
-                    logger.warning("Could not find search placeholder, attempting alternative search")
-                
-                # Select the asset from the list by text
-                page.get_by_text(asset).first.click()
-                page.wait_for_timeout(500)
-                
-                # Duration: click duration field and select preset (e.g., M5 for 5 minutes)
-                logger.info("Setting duration", extra={"duration_minutes": duration_minutes, "selector": self.settings.selector_duration_field})
-                page.wait_for_selector(self.settings.selector_duration_field, timeout=60000)
-                page.click(self.settings.selector_duration_field)
-                page.wait_for_timeout(200)
-                
-                # Map duration to preset labels (TODO: make this configurable)
-                if duration_minutes == 5:
-                    page.get_by_text("M5").first.wait_for(timeout=10000)
-                    page.get_by_text("M5").first.click()
-                elif duration_minutes == 1:
-                    page.get_by_text("M1").first.wait_for(timeout=10000)
-                    page.get_by_text("M1").first.click()
-                elif duration_minutes == 15:
-                    page.get_by_text("M15").first.wait_for(timeout=10000)
-                    page.get_by_text("M15").first.click()
-                elif duration_minutes == 30:
-                    page.get_by_text("M30").first.wait_for(timeout=10000)
-                    page.get_by_text("M30").first.click()
-                else:
-                    logger.warning(
-                        "Unsupported duration, attempting to proceed without changing",
-                        extra={"duration_minutes": duration_minutes}
-                    )
-                page.wait_for_timeout(200)
-                
-                # Stake: click amount field and fill
-                logger.info("Setting stake", extra={"stake": stake, "selector": self.settings.selector_stake_field})
-                page.wait_for_selector(self.settings.selector_stake_field, timeout=60000)
-                stake_locator = page.locator(self.settings.selector_stake_field)
-                stake_locator.click()
-                stake_locator.fill(str(stake))
-                page.wait_for_timeout(500)
-                
-                # Direction & place-trade: BUY/SELL buttons act as both direction and place-trade
-                if direction in (PocketOptionDirection.UP, PocketOptionDirection.CALL, PocketOptionDirection.HIGHER):
-                    logger.info("Clicking UP (BUY) button (direction + place trade)", extra={"selector": self.settings.selector_direction_up})
-                    page.wait_for_selector(self.settings.selector_direction_up, timeout=60000)
-                    page.click(self.settings.selector_direction_up)
-                elif direction in (PocketOptionDirection.DOWN, PocketOptionDirection.PUT, PocketOptionDirection.LOWER):
-                    logger.info("Clicking DOWN (SELL) button (direction + place trade)", extra={"selector": self.settings.selector_direction_down})
-                    page.wait_for_selector(self.settings.selector_direction_down, timeout=60000)
-                    page.click(self.settings.selector_direction_down)
-                else:
-                    raise RuntimeError(f"Unsupported direction: {direction}")
-                
-                # Wait for trade confirmation
-                page.wait_for_timeout(1000)
-                
-                logger.info(
-                    "ENTRY trade placed via UI",
-                    extra={
-                        "asset": asset,
-                        "duration_minutes": duration_minutes,
-                        "direction": direction.value if direction else None,
-                        "stake": stake,
-                    }
-                )
-                
-        except Exception as e:
-            logger.error("Failed to place ENTRY trade via UI", extra={"error": str(e)}, exc_info=True)
-            raise RuntimeError(f"UI trade execution failed: {e}") from e
-        finally:
-            # Cleanup
-            if page:
-                try:
-                    page.close()
-                except Exception:
-                    pass
-            if context:
-                try:
-                    context.close()
-                except Exception:
-                    pass
-            if browser:
-                try:
-                    browser.close()
-                except Exception:
-                    pass
-
+        self._run(lambda driver: driver.place_entry_trade(asset, duration_minutes, direction, stake))
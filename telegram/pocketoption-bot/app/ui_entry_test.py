@@ -1,93 +1,153 @@
 """CLI script to test PocketOption UI entry trade placement."""
 
+import argparse
+import asyncio
 import sys
+from typing import List, Optional, TYPE_CHECKING
 
-from app.config import get_settings
+from app.config import PocketOptionBotConfig, get_settings
 from app.env_loader import load_local_env
 from app.logging_config import get_logger
 from app.models.pocketoption import PocketOptionDirection
-from app.ui_driver.playwright_driver import PocketOptionUIDriver
+from app.ui_driver.async_playwright_driver import ASYNC_PLAYWRIGHT, AsyncPocketOptionUIDriver
+
+if TYPE_CHECKING:
+    from playwright.async_api import Playwright
 
 logger = get_logger("ui-entry-test")
 
+# Demo ENTRY trade placed by this script
+_ASSET = "GBP/USD OTC"
+_DURATION_MINUTES = 5
+_DIRECTION = PocketOptionDirection.DOWN  # LOWER maps to DOWN
+_STAKE = 1.0  # demo stake
 
-def main() -> int:
-    """Main entry point for UI entry test."""
-    try:
-        # Load .env for local CLI usage
-        load_local_env()
 
-        settings = get_settings()
+def _load_settings() -> Optional[PocketOptionBotConfig]:
+    """Load .env and settings; returns None (after reporting) if the UI is disabled."""
+    # Load .env for local CLI usage
+    load_local_env()
 
-        # Simple sanity check: make sure UI is enabled
-        if not settings.ui_enabled:
-            msg = "POCKETOPTION_UI_ENABLED is false; enable it in .env to run UI entry test."
-            logger.error(msg)
-            print(msg, file=sys.stderr)
-            return 1
+    settings = get_settings()
 
-        logger.info("Creating PocketOptionUIDriver")
-        try:
-            driver = PocketOptionUIDriver(settings)
-        except RuntimeError as e:
-            error_msg = f"Failed to create UI driver: {e}"
-            print(error_msg, file=sys.stderr)
-            logger.error(error_msg)
-            return 1
+    # Simple sanity check: make sure UI is enabled
+    if not settings.ui_enabled:
+        msg = "POCKETOPTION_UI_ENABLED is false; enable it in .env to run UI entry test."
+        logger.error(msg)
+        print(msg, file=sys.stderr)
+        return None
+    return settings
+
+
+def _report(error_msg: str) -> int:
+    """Report a failure to stderr and the log; returns the exit code."""
+    print(error_msg, file=sys.stderr)
+    logger.error(error_msg)
+    return 1
+
+
+async def _run(settings: PocketOptionBotConfig, playwright: Optional["Playwright"] = None) -> int:
+    """
+    Login and place a single demo ENTRY trade on one browser.
+    
+    Args:
+        settings: PocketOption bot configuration
+        playwright: Already started Playwright instance for the driver to take over
+    """
+    try:
+        driver = AsyncPocketOptionUIDriver(settings)
+    except RuntimeError as e:
+        if playwright is not None:
+            await playwright.stop()
+        return _report(f"Failed to create UI driver: {e}")
+
+    try:
+        await driver.start(playwright)
 
         # 1) Login
         logger.info("Starting login flow")
         try:
-            driver.login()
+            await driver.login()
         except RuntimeError as e:
-            error_msg = f"PocketOption UI login failed: {e}"
-            print(error_msg, file=sys.stderr)
-            logger.error(error_msg)
-            return 1
-        except Exception as e:
-            error_msg = f"PocketOption UI login failed: {e}"
-            print(error_msg, file=sys.stderr)
-            logger.error(error_msg, exc_info=True)
-            return 1
-        
+            return _report(f"PocketOption UI login failed: {e}")
         logger.info("Login successful")
 
         # 2) Place a single ENTRY trade
-        asset = "GBP/USD OTC"
-        duration_minutes = 5
-        direction = PocketOptionDirection.DOWN  # LOWER maps to DOWN
-        stake = 1.0  # demo stake
-
         logger.info(
             "Placing ENTRY trade",
             extra={
-                "asset": asset,
-                "duration_minutes": duration_minutes,
-                "direction": direction.value,
-                "stake": stake,
+                "asset": _ASSET,
+                "duration_minutes": _DURATION_MINUTES,
+                "direction": _DIRECTION.value,
+                "stake": _STAKE,
             }
         )
-
         try:
-            driver.place_entry_trade(
-                asset=asset,
-                duration_minutes=duration_minutes,
-                direction=direction,
-                stake=stake,
+            await driver.place_entry_trade(
+                asset=_ASSET,
+                duration_minutes=_DURATION_MINUTES,
+                direction=_DIRECTION,
+                stake=_STAKE,
             )
-            logger.info("ENTRY trade flow executed successfully")
-            print("PocketOption UI entry test completed.")
-            return 0
-        except Exception as e:
-            error_msg = f"PocketOption UI entry trade failed: {e}"
-            print(error_msg, file=sys.stderr)
-            logger.error(error_msg, exc_info=True)
+        except RuntimeError as e:
+            return _report(f"PocketOption UI entry trade failed: {e}")
+    finally:
+        await driver.close()
+
+    logger.info("ENTRY trade flow executed successfully")
+    print("PocketOption UI entry test completed.")
+    return 0
+
+
+async def _run_async() -> int:
+    """
+    Async variant: start Playwright while .env/settings load, then login and trade.
+    
+    The Playwright driver process starts concurrently with settings loading
+    (run in a thread), hiding part of the browser startup latency.
+    """
+    if ASYNC_PLAYWRIGHT is None:
+        return _report("Failed to create UI driver: Playwright is not installed.")
+
+    playwright_task = asyncio.create_task(ASYNC_PLAYWRIGHT().start())
+    try:
+        settings = await asyncio.to_thread(_load_settings)
+    except BaseException:
+        await (await playwright_task).stop()
+        raise
+    playwright = await playwright_task
+    if settings is None:
+        await playwright.stop()
+        return 1
+    return await _run(settings, playwright)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Main entry point for UI entry test."""
+    parser = argparse.ArgumentParser(description="Login and place a demo ENTRY trade via the UI")
+    parser.add_argument(
+        "--async",
+        dest="use_async",
+        action="store_true",
+        help="Start Playwright while settings load, overlapping browser startup with it",
+    )
+    args = parser.parse_args(argv)
+
+    try:
+        if args.use_async:
+            return asyncio.run(_run_async())
+
+        settings = _load_settings()
+        if settings is None:
             return 1
+        # One browser for the whole run: login and entry share it
+        return asyncio.run(_run(settings))
 
     except Exception as e:
         error_msg = f"Unexpected error during UI entry test: {e}"
         print(error_msg, file=sys.stderr)
-        logger.error(error_msg, exc_info=True)
+        logger.error(error_msg)
+        logger.debug(error_msg, exc_info=True)
         return 1
 
 
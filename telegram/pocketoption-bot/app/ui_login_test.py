@@ -1,8 +1,9 @@
 """CLI script to test PocketOption UI login."""
 
 import sys
+from typing import Optional
 
-from app.config import get_settings
+from app.config import PocketOptionBotConfig, get_settings
 from app.env_loader import load_local_env
 from app.logging_config import get_logger
 from app.ui_driver.playwright_driver import PocketOptionUIDriver
@@ -10,6 +11,45 @@ from app.ui_driver.playwright_driver import PocketOptionUIDriver
 logger = get_logger("ui-login-test")
 
 
+def create_driver(settings: PocketOptionBotConfig) -> Optional[PocketOptionUIDriver]:
+    """
+    Create the UI driver, reporting failures to stderr and the log.
+    
+    Returns:
+        The driver, or None if it could not be created
+    """
+    try:
+        return PocketOptionUIDriver(settings)
+    except RuntimeError as e:
+        error_msg = f"Failed to create UI driver: {e}"
+        print(error_msg, file=sys.stderr)
+        logger.error(error_msg)
+        return None
+
+
+def run_login(driver: PocketOptionUIDriver) -> bool:
+    """
+    Run the UI login flow, reporting failures to stderr and the log.
+    
+    Returns:
+        True if login succeeded
+    """
+    try:
+        driver.login()
+    except RuntimeError as e:
+        error_msg = f"PocketOption UI login failed: {e}"
+        print(error_msg, file=sys.stderr)
+        logger.error(error_msg)
+        return False
+    except Exception as e:
+        error_msg = f"PocketOption UI login failed: {e}"
+        print(error_msg, file=sys.stderr)
+        logger.error(error_msg)
+        logger.debug(error_msg, exc_info=True)
+        return False
+    return True
+
+
 def main() -> int:
     """Main entry point for UI login test."""
     try:
@@ -26,26 +66,12 @@ def main() -> int:
             return 1
         
         # Attempt to create driver
-        try:
-            driver = PocketOptionUIDriver(settings)
-        except RuntimeError as e:
-            error_msg = f"Failed to create UI driver: {e}"
-            print(error_msg, file=sys.stderr)
-            logger.error(error_msg)
+        driver = create_driver(settings)
+        if driver is None:
             return 1
         
         # Attempt login
-        try:
-            driver.login()
-        except RuntimeError as e:
-            error_msg = f"PocketOption UI login failed: {e}"
-            print(error_msg, file=sys.stderr)
-            logger.error(error_msg)
-            return 1
-        except Exception as e:
-            error_msg = f"PocketOption UI login failed: {e}"
-            print(error_msg, file=sys.stderr)
-            logger.error(error_msg, exc_info=True)
+        if not run_login(driver):
             return 1
         
         success_msg = "PocketOption UI login successful."
@@ -56,7 +82,8 @@ def main() -> int:
     except Exception as e:
         error_msg = f"Unexpected error during UI login test: {e}"
         print(error_msg, file=sys.stderr)
-        logger.error(error_msg, exc_info=True)
+        logger.error(error_msg)
+        logger.debug(error_msg, exc_info=True)
         return 1
 
 
@@ -0,0 +1,142 @@
+"""Tests for the detached Chromium daemon used by the UI CLI scripts."""
+
+import json
+import os
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from app.ui_driver import browser_daemon
+from app.ui_driver.browser_daemon import start_browser_daemon
+
+ENDPOINT = "ws://127.0.0.1:9222/devtools/browser/abc"
+
+
+def _write_record(endpoint_file, **overrides) -> None:
+    record = {"endpoint": ENDPOINT, "pid": os.getpid(), "user_data_dir": str(endpoint_file.parent / "profile")}
+    record.update(overrides)
+    endpoint_file.write_text(json.dumps(record), encoding="utf-8")
+
+
+def test_recorded_browser_is_reused(tmp_path):
+    """Test that the browser recorded by a previous start is reused without launching."""
+    endpoint_file = tmp_path / "endpoint"
+    _write_record(endpoint_file)
+    
+    with patch.object(browser_daemon, "get_ws_endpoint", return_value=ENDPOINT), \
+            patch.object(browser_daemon, "SYNC_PLAYWRIGHT") as mock_playwright, \
+            patch("subprocess.Popen") as popen:
+        endpoint = start_browser_daemon(
+            user_data_dir=str(tmp_path / "profile"), endpoint_file=str(endpoint_file)
+        )
+    
+    assert endpoint == ENDPOINT
+    mock_playwright.assert_not_called()
+    popen.assert_not_called()
+
+
+@pytest.mark.parametrize(
+    "record",
+    [
+        None,
+        {"endpoint": "ws://127.0.0.1:9222/devtools/browser/other"},
+        {"user_data_dir": "/tmp/someone-else"},
+        {"pid": 2 ** 22 + 1},
+    ],
+    ids=["no-record", "other-browser", "other-profile", "dead-pid"],
+)
+def test_unrecorded_browser_on_port_is_refused(tmp_path, record):
+    """Test that a browser on the port is not trusted unless it matches our record."""
+    endpoint_file = tmp_path / "endpoint"
+    if record is not None:
+        _write_record(endpoint_file, **record)
+    
+    with patch.object(browser_daemon, "get_ws_endpoint", return_value=ENDPOINT), \
+            patch("subprocess.Popen") as popen:
+        with pytest.raises(RuntimeError, match="Port 9222 is in use"):
+            start_browser_daemon(
+                user_data_dir=str(tmp_path / "profile"), endpoint_file=str(endpoint_file)
+            )
+    
+    popen.assert_not_called()
+
+
+def test_foreign_record_is_not_trusted(tmp_path):
+    """Test that a record file owned by another user is ignored."""
+    endpoint_file = tmp_path / "endpoint"
+    _write_record(endpoint_file)
+    
+    with patch("os.getuid", return_value=os.getuid() + 1):
+        assert browser_daemon._read_record(str(endpoint_file)) is None
+
+
+def test_launch_creates_private_profile_dir(tmp_path):
+    """Test that a new Chromium gets a 0700 profile dir and is recorded in a private endpoint file."""
+    profile = tmp_path / "profile"
+    
+    with patch.object(browser_daemon, "get_ws_endpoint", side_effect=[None, None, ENDPOINT]), \
+            patch.object(browser_daemon, "SYNC_PLAYWRIGHT", MagicMock()), \
+            patch("subprocess.Popen") as popen, \
+            patch("time.sleep"):
+        popen.return_value.pid = 4242
+        endpoint = start_browser_daemon(
+            user_data_dir=str(profile), endpoint_file=str(tmp_path / "endpoint")
+        )
+    
+    assert endpoint == ENDPOINT
+    assert profile.stat().st_mode & 0o777 == 0o700
+    endpoint_file = tmp_path / "endpoint"
+    assert json.loads(endpoint_file.read_text(encoding="utf-8")) == {
+        "endpoint": ENDPOINT, "pid": 4242, "user_data_dir": str(profile),
+    }
+    assert endpoint_file.stat().st_mode & 0o777 == 0o600
+    args = popen.call_args.args[0]
+    assert f"--user-data-dir={profile}" in args
+    assert "--headless=new" in args
+
+
+def test_existing_profile_dir_is_restricted(tmp_path):
+    """Test that an existing profile dir of ours is tightened to 0700."""
+    profile = tmp_path / "profile"
+    profile.mkdir(mode=0o755)
+    
+    browser_daemon._ensure_private_dir(str(profile))
+    
+    assert profile.stat().st_mode & 0o777 == 0o700
+
+
+def test_foreign_paths_are_refused(tmp_path):
+    """Test that profile dirs and endpoint files owned by another user are rejected."""
+    profile = tmp_path / "profile"
+    profile.mkdir()
+    endpoint_file = tmp_path / "endpoint"
+    endpoint_file.write_text("old", encoding="utf-8")
+    
+    with patch("os.getuid", return_value=os.getuid() + 1):
+        with pytest.raises(RuntimeError, match="not owned"):
+            browser_daemon._ensure_private_dir(str(profile))
+        with pytest.raises(RuntimeError, match="not owned"):
+            browser_daemon._write_private_file(str(endpoint_file), ENDPOINT)
+    
+    assert endpoint_file.read_text(encoding="utf-8") == "old"
+
+
+def test_symlinked_endpoint_file_is_refused(tmp_path):
+    """Test that a symlink planted at the endpoint path is not followed."""
+    target = tmp_path / "target"
+    target.write_text("", encoding="utf-8")
+    link = tmp_path / "endpoint"
+    link.symlink_to(target)
+    
+    with pytest.raises(RuntimeError, match="symlink"):
+        browser_daemon._write_private_file(str(link), ENDPOINT)
+
+
+def test_missing_playwright_and_no_running_browser(tmp_path):
+    """Test that launching without Playwright fails cleanly."""
+    with patch.object(browser_daemon, "get_ws_endpoint", return_value=None), \
+            patch.object(browser_daemon, "SYNC_PLAYWRIGHT", None):
+        with pytest.raises(RuntimeError, match="Playwright is not installed"):
+            start_browser_daemon(
+                user_data_dir=str(tmp_path / "profile"), endpoint_file=str(tmp_path / "endpoint")
+            )
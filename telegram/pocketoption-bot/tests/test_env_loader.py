@@ -0,0 +1,31 @@
+"""Tests for the local .env loader."""
+
+import os
+from unittest.mock import patch
+
+from app.env_loader import load_local_env
+
+
+def test_load_local_env_parses_quotes_and_skips_comments(tmp_path):
+    """Test quoting, comments and that existing env vars win."""
+    env_file = tmp_path / "test.env"
+    env_file.write_text(
+        "# comment\n"
+        "\n"
+        "POCKETOPTION_TEST_BARE = plain value\n"
+        'POCKETOPTION_TEST_DQ="double quoted"\n'
+        "POCKETOPTION_TEST_SQ='single quoted'\n"
+        "POCKETOPTION_TEST_HASH=abc#123\n"
+        "POCKETOPTION_TEST_EXISTING=from-file\n"
+        "not a key value line\n",
+        encoding="utf-8",
+    )
+    
+    with patch.dict(os.environ, {"POCKETOPTION_TEST_EXISTING": "from-shell"}, clear=False):
+        assert load_local_env(str(env_file)) == env_file
+        
+        assert os.environ["POCKETOPTION_TEST_BARE"] == "plain value"
+        assert os.environ["POCKETOPTION_TEST_DQ"] == "double quoted"
+        assert os.environ["POCKETOPTION_TEST_SQ"] == "single quoted"
+        assert os.environ["POCKETOPTION_TEST_HASH"] == "abc#123"
+        assert os.environ["POCKETOPTION_TEST_EXISTING"] == "from-shell"
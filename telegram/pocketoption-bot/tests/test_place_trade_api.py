@@ -6,20 +6,22 @@ from unittest.mock import patch
 import pytest
 from fastapi.testclient import TestClient
 
+from app.config import PocketOptionBotConfig
 from app.main import app
+from app.service.trade_executor import TradeExecutor
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def client():
-    """Create test client."""
-    return TestClient(app)
+    """Create a test client shared by all tests in this module (lifespan runs once)."""
+    with TestClient(app) as test_client:
+        yield test_client
 
 
 @pytest.fixture
 def default_settings():
     """Patch settings with defaults."""
     with patch("app.main.get_settings") as mock_get_settings:
-        from app.config import PocketOptionBotConfig
         mock_get_settings.return_value = PocketOptionBotConfig(
             enabled=True,
             dry_run=True,
@@ -161,7 +163,6 @@ def test_place_trade_missing_required_fields(client, default_settings):
 def test_place_trade_disabled_bot(client):
     """Test POST /place_trade when bot is disabled."""
     with patch("app.main.get_settings") as mock_get_settings:
-        from app.config import PocketOptionBotConfig
         mock_get_settings.return_value = PocketOptionBotConfig(
             enabled=False,
             dry_run=True,
@@ -171,7 +172,6 @@ def test_place_trade_disabled_bot(client):
         )
         
         # Recreate executor with disabled config
-        from app.service.trade_executor import TradeExecutor
         executor = TradeExecutor(mock_get_settings.return_value)
         
         with patch("app.main.executor", executor):
@@ -198,7 +198,6 @@ def test_place_trade_disabled_bot(client):
 def test_place_trade_max_stake_clamping(client):
     """Test POST /place_trade with max_stake_per_trade clamping."""
     with patch("app.main.get_settings") as mock_get_settings:
-        from app.config import PocketOptionBotConfig
         mock_get_settings.return_value = PocketOptionBotConfig(
             enabled=True,
             dry_run=True,
@@ -207,7 +206,6 @@ def test_place_trade_max_stake_clamping(client):
             account_type="DEMO",
         )
         
-        from app.service.trade_executor import TradeExecutor
         executor = TradeExecutor(mock_get_settings.return_value)
         
         with patch("app.main.executor", executor):
@@ -228,3 +226,49 @@ def test_place_trade_max_stake_clamping(client):
             data = response.json()
             assert data["status"] == "accepted"
 
+
+
+def test_place_trade_batch(client, default_settings):
+    """Test POST /place_trade_batch returns one result per signal, in order."""
+    payload = [
+        {
+            "signal_type": "PREPARE",
+            "asset": "GBP/USD OTC",
+            "raw_message_id": 12352,
+            "raw_channel_id": -1002019935922,
+            "raw_text": "Prepare a currency GBP/USD OTC",
+        },
+        {
+            "signal_type": "ENTRY",
+            "asset": "GBP/USD OTC",
+            "duration_minutes": 5,
+            "direction": "LOWER",
+            "raw_message_id": 12353,
+            "raw_channel_id": -1002019935922,
+            "raw_text": "GBP/USD OTC 5 min LOWER",
+        },
+    ]
+    
+    response = client.post("/place_trade_batch", json=payload)
+    assert response.status_code == 200
+    
+    data = response.json()
+    assert len(data) == 2
+    assert "prepare" in data[0]["reason"].lower()
+    assert data[1]["status"] == "accepted"
+
+
+def test_place_trade_batch_rejects_oversized_batch(client):
+    """Test POST /place_trade_batch refuses more signals than max_batch_size."""
+    signal = {
+        "signal_type": "PREPARE",
+        "asset": "GBP/USD OTC",
+        "raw_message_id": 12354,
+        "raw_channel_id": -1002019935922,
+        "raw_text": "Prepare a currency GBP/USD OTC",
+    }
+    
+    with patch("app.main.settings", PocketOptionBotConfig(max_batch_size=2)):
+        response = client.post("/place_trade_batch", json=[signal] * 3)
+    
+    assert response.status_code == 413
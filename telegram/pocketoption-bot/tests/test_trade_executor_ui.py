@@ -5,141 +5,72 @@ from unittest.mock import patch
 
 import pytest
 
+import app.config
 from app.config import PocketOptionBotConfig
 from app.models.pocketoption import PocketOptionDirection, PocketOptionSignal, PocketOptionSignalType
 from app.service.trade_executor import TradeExecutor
 
 
-def test_entry_dry_run_true_ui_enabled_false():
-    """Test ENTRY with DRY_RUN=True, UI_ENABLED should not matter."""
-    import app.config
-    app.config._settings = None
-    
-    with patch.dict(os.environ, {
-        "POCKETOPTION_ENABLED": "true",
-        "POCKETOPTION_DRY_RUN": "true",
-        "POCKETOPTION_UI_ENABLED": "false",  # Should not matter
-        "POCKETOPTION_BASE_STAKE": "1.0",
-    }, clear=False):
-        settings = PocketOptionBotConfig.from_env()
-        executor = TradeExecutor(settings)
-        
-        signal = PocketOptionSignal(
-            signal_type=PocketOptionSignalType.ENTRY,
-            asset="GBP/USD OTC",
-            duration_minutes=5,
-            direction=PocketOptionDirection.DOWN,
-            amount_multiplier=None,
-            raw_message_id=12345,
-            raw_channel_id=-1002019935922,
-            raw_text="GBP/USD OTC 5 min LOWER",
-        )
-        
-        result = executor.execute(signal)
-        
-        assert result.status == "accepted"
-        assert result.dry_run is True
-        assert result.enabled is True
-        assert "DRY-RUN" in result.reason
+@pytest.fixture(scope="module")
+def entry_signal():
+    """ENTRY signal shared by all tests (executor does not mutate it)."""
+    return PocketOptionSignal(
+        signal_type=PocketOptionSignalType.ENTRY,
+        asset="GBP/USD OTC",
+        duration_minutes=5,
+        direction=PocketOptionDirection.DOWN,
+        amount_multiplier=None,
+        raw_message_id=12345,
+        raw_channel_id=-1002019935922,
+        raw_text="GBP/USD OTC 5 min LOWER",
+    )
 
 
-def test_entry_dry_run_true_ui_enabled_true():
-    """Test ENTRY with DRY_RUN=True, UI_ENABLED=True should not matter."""
-    import app.config
+def _make_executor(dry_run: bool, ui_enabled: bool) -> TradeExecutor:
+    """Build an executor from env, as the service does."""
     app.config._settings = None
     
     with patch.dict(os.environ, {
         "POCKETOPTION_ENABLED": "true",
-        "POCKETOPTION_DRY_RUN": "true",
-        "POCKETOPTION_UI_ENABLED": "true",  # Should not matter
+        "POCKETOPTION_DRY_RUN": str(dry_run).lower(),
+        "POCKETOPTION_UI_ENABLED": str(ui_enabled).lower(),
         "POCKETOPTION_BASE_STAKE": "1.0",
     }, clear=False):
-        settings = PocketOptionBotConfig.from_env()
-        executor = TradeExecutor(settings)
-        
-        signal = PocketOptionSignal(
-            signal_type=PocketOptionSignalType.ENTRY,
-            asset="GBP/USD OTC",
-            duration_minutes=5,
-            direction=PocketOptionDirection.DOWN,
-            amount_multiplier=None,
-            raw_message_id=12346,
-            raw_channel_id=-1002019935922,
-            raw_text="GBP/USD OTC 5 min LOWER",
-        )
-        
-        result = executor.execute(signal)
-        
-        assert result.status == "accepted"
-        assert result.dry_run is True
-        assert result.enabled is True
-        assert "DRY-RUN" in result.reason
+        return TradeExecutor(PocketOptionBotConfig.from_env())
 
 
-def test_entry_dry_run_false_ui_enabled_false():
-    """Test ENTRY with DRY_RUN=False, UI_ENABLED=False should return error."""
-    import app.config
-    app.config._settings = None
+@pytest.mark.parametrize(
+    "dry_run,ui_enabled,expected_status,expected_reason",
+    [
+        # DRY_RUN=True: UI_ENABLED should not matter
+        (True, False, "accepted", "DRY-RUN"),
+        (True, True, "accepted", "DRY-RUN"),
+        # DRY_RUN=False without UI: error
+        (False, False, "error", "UI disabled"),
+    ],
+    ids=["dry_run-ui_disabled", "dry_run-ui_enabled", "live-ui_disabled"],
+)
+def test_entry_dry_run_and_ui_enabled(entry_signal, dry_run, ui_enabled, expected_status, expected_reason):
+    """Test ENTRY outcome for DRY_RUN / UI_ENABLED combinations."""
+    executor = _make_executor(dry_run=dry_run, ui_enabled=ui_enabled)
     
-    with patch.dict(os.environ, {
-        "POCKETOPTION_ENABLED": "true",
-        "POCKETOPTION_DRY_RUN": "false",
-        "POCKETOPTION_UI_ENABLED": "false",
-        "POCKETOPTION_BASE_STAKE": "1.0",
-    }, clear=False):
-        settings = PocketOptionBotConfig.from_env()
-        executor = TradeExecutor(settings)
-        
-        signal = PocketOptionSignal(
-            signal_type=PocketOptionSignalType.ENTRY,
-            asset="GBP/USD OTC",
-            duration_minutes=5,
-            direction=PocketOptionDirection.DOWN,
-            amount_multiplier=None,
-            raw_message_id=12347,
-            raw_channel_id=-1002019935922,
-            raw_text="GBP/USD OTC 5 min LOWER",
-        )
-        
-        result = executor.execute(signal)
-        
-        assert result.status == "error"
-        assert result.dry_run is False
-        assert result.enabled is True
-        assert "UI disabled" in result.reason
+    result = executor.execute(entry_signal)
+    
+    assert result.status == expected_status
+    assert result.dry_run is dry_run
+    assert result.enabled is True
+    assert expected_reason in result.reason
 
 
-def test_entry_dry_run_false_ui_enabled_true_no_playwright():
+def test_entry_dry_run_false_ui_enabled_true_no_playwright(entry_signal):
     """Test ENTRY with DRY_RUN=False, UI_ENABLED=True but Playwright not installed."""
-    import app.config
-    app.config._settings = None
+    executor = _make_executor(dry_run=False, ui_enabled=True)
     
-    with patch.dict(os.environ, {
-        "POCKETOPTION_ENABLED": "true",
-        "POCKETOPTION_DRY_RUN": "false",
-        "POCKETOPTION_UI_ENABLED": "true",
-        "POCKETOPTION_BASE_STAKE": "1.0",
-    }, clear=False):
-        settings = PocketOptionBotConfig.from_env()
-        executor = TradeExecutor(settings)
+    # Mock import failure by patching the import inside the function
+    with patch("app.ui_driver.playwright_driver.ASYNC_PLAYWRIGHT", None):
+        # This will cause RuntimeError when trying to create driver
+        result = executor.execute(entry_signal)
         
-        signal = PocketOptionSignal(
-            signal_type=PocketOptionSignalType.ENTRY,
-            asset="GBP/USD OTC",
-            duration_minutes=5,
-            direction=PocketOptionDirection.DOWN,
-            amount_multiplier=None,
-            raw_message_id=12348,
-            raw_channel_id=-1002019935922,
-            raw_text="GBP/USD OTC 5 min LOWER",
-        )
-        
-        # Mock import failure by patching the import inside the function
-        with patch("app.ui_driver.playwright_driver.SYNC_PLAYWRIGHT", None):
-            # This will cause RuntimeError when trying to create driver
-            result = executor.execute(signal)
-            
-            # Should handle gracefully and return error
-            assert result.status == "error"
-            assert "initialization failed" in result.reason.lower() or "not available" in result.reason.lower()
-
+        # Should handle gracefully and return error
+        assert result.status == "error"
+        assert "initialization failed" in result.reason.lower() or "not available" in result.reason.lower()
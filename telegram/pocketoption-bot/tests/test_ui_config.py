@@ -5,13 +5,13 @@ from unittest.mock import patch
 
 import pytest
 
+import app.config
 from app.config import PocketOptionBotConfig, get_settings
 
 
 def test_ui_config_defaults():
     """Test that UI config fields exist with correct defaults."""
     # Clear any existing settings instance
-    import app.config
     app.config._settings = None
     
     # Test with minimal env (no UI vars set)
@@ -32,7 +32,6 @@ def test_ui_config_defaults():
 def test_ui_config_from_env():
     """Test loading UI config from environment variables."""
     # Clear any existing settings instance
-    import app.config
     app.config._settings = None
     
     env_vars = {
@@ -62,7 +61,6 @@ def test_ui_config_from_env():
 def test_ui_config_existing_fields_unchanged():
     """Test that existing config fields are not affected by UI additions."""
     # Clear any existing settings instance
-    import app.config
     app.config._settings = None
     
     with patch.dict(os.environ, {}, clear=False):
@@ -79,7 +77,6 @@ def test_ui_config_existing_fields_unchanged():
 def test_login_manual_wait_and_trading_root_defaults():
     """Test that login manual wait and trading root selector have correct defaults."""
     # Clear any existing settings instance
-    import app.config
     app.config._settings = None
     
     with patch.dict(os.environ, {}, clear=False):
@@ -96,7 +93,6 @@ def test_login_manual_wait_and_trading_root_defaults():
 def test_trading_url_defaults_demo_mode():
     """Test that trading URL defaults to demo mode."""
     # Clear any existing settings instance
-    import app.config
     app.config._settings = None
     
     with patch.dict(os.environ, {}, clear=False):
@@ -116,3 +112,13 @@ def test_trading_url_defaults_demo_mode():
         # In default mode, trading_url should point to the demo trading URL
         assert settings.trading_url == settings.trading_url_demo
 
+
+
+def test_duration_presets_from_env():
+    """Test that duration presets are parsed from JSON with integer keys."""
+    app.config._settings = None
+    
+    with patch.dict(os.environ, {"POCKETOPTION_DURATION_PRESETS": '{"3": "M3"}'}, clear=False):
+        settings = PocketOptionBotConfig.from_env()
+        
+        assert settings.duration_presets == {3: "M3"}
@@ -0,0 +1,261 @@
+"""Tests for the async UI driver."""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.config import PocketOptionBotConfig
+from app.models.pocketoption import PocketOptionDirection
+from app.ui_driver.async_playwright_driver import AsyncPocketOptionUIDriver
+
+
+def _make_driver(**settings) -> AsyncPocketOptionUIDriver:
+    with patch("app.ui_driver.async_playwright_driver.ASYNC_PLAYWRIGHT", MagicMock()):
+        return AsyncPocketOptionUIDriver(PocketOptionBotConfig(**settings))
+
+
+def test_async_driver_requires_playwright():
+    """Test that the async driver refuses to start without Playwright."""
+    with patch("app.ui_driver.async_playwright_driver.ASYNC_PLAYWRIGHT", None):
+        with pytest.raises(RuntimeError, match="Playwright is not installed"):
+            AsyncPocketOptionUIDriver(PocketOptionBotConfig())
+
+
+@pytest.mark.asyncio
+async def test_place_entry_trades_runs_concurrently_and_collects_errors():
+    """Test that place_entry_trades gathers all trades and reports failures per trade."""
+    driver = _make_driver()
+    driver.start = AsyncMock()
+    running = 0
+    peak = 0
+    
+    async def fake_trade(asset, **kwargs):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0)
+        running -= 1
+        if asset == "BAD":
+            raise RuntimeError("boom")
+    
+    driver.place_entry_trade = fake_trade
+    trades = [
+        {"asset": "GBP/USD OTC", "duration_minutes": 5, "direction": PocketOptionDirection.DOWN, "stake": 1.0},
+        {"asset": "BAD", "duration_minutes": 5, "direction": PocketOptionDirection.UP, "stake": 1.0},
+    ]
+    
+    results = await driver.place_entry_trades(trades)
+    
+    assert peak == 2
+    assert results[0] is None
+    assert isinstance(results[1], RuntimeError)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_start_launches_one_browser():
+    """Test that concurrent start() calls share a single browser launch."""
+    driver = _make_driver()
+    playwright = MagicMock()
+    
+    async def slow_launch(**kwargs):
+        await asyncio.sleep(0)
+        return MagicMock()
+    
+    playwright.chromium.launch = AsyncMock(side_effect=slow_launch)
+    
+    await asyncio.gather(driver.start(playwright), driver.start(playwright))
+    
+    playwright.chromium.launch.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_async_place_entry_trade_missing_selectors():
+    """Test that missing trading selectors fail before the browser is launched."""
+    driver = _make_driver()
+    driver.start = AsyncMock()
+    
+    with pytest.raises(RuntimeError, match="Missing required trading selectors"):
+        await driver.place_entry_trade("GBP/USD OTC", 5, PocketOptionDirection.DOWN, 1.0)
+    
+    driver.start.assert_not_called()
+
+
+def _login_settings(**overrides) -> dict:
+    values = {
+        "login_url": "https://pocketoption.com/en/login/",
+        "username": "user@example.com",
+        "password": "secret",
+        "selector_username": "#email",
+        "selector_password": "#password",
+        "selector_login_button": "#login",
+    }
+    values.update(overrides)
+    return values
+
+
+def _mock_page(page_url: str, context: MagicMock) -> MagicMock:
+    page = MagicMock(url=page_url, context=context)
+    for name in (
+        "goto", "wait_for_timeout", "wait_for_load_state", "wait_for_selector",
+        "evaluate", "fill", "click", "route", "close",
+    ):
+        setattr(page, name, AsyncMock())
+    page.evaluate.return_value = True
+    # Locator factories are sync; the returned locators are awaited
+    for name in ("locator", "get_by_placeholder", "get_by_text"):
+        setattr(page, name, MagicMock(return_value=AsyncMock()))
+    return page
+
+
+def _mock_context(page_url: str) -> MagicMock:
+    context = MagicMock()
+    context.close = AsyncMock()
+    context.route = AsyncMock()
+    context.storage_state = AsyncMock(return_value={"cookies": [], "origins": []})
+    context.new_page = AsyncMock(return_value=_mock_page(page_url, context))
+    return context
+
+
+def _mock_browser(page_url: str) -> MagicMock:
+    browser = MagicMock()
+    browser.new_context = AsyncMock(return_value=_mock_context(page_url))
+    browser.close = AsyncMock()
+    return browser
+
+
+@pytest.mark.asyncio
+async def test_async_login_captures_and_persists_storage_state(tmp_path):
+    """Test that a successful async login keeps and persists the storage state."""
+    state_path = tmp_path / "auth.json"
+    driver = _make_driver(**_login_settings(auth_state_path=str(state_path)))
+    driver.browser = _mock_browser("https://pocketoption.com/en/cabinet/")
+    
+    await driver.login()
+    
+    page = driver.browser.new_context.return_value.new_page.return_value
+    page.click.assert_awaited_once_with("#login")
+    assert driver.storage_state == {"cookies": [], "origins": []}
+    assert state_path.is_file()
+
+
+@pytest.mark.asyncio
+async def test_async_login_skips_form_with_valid_storage_state():
+    """Test that a still-valid storage state skips the login form."""
+    driver = _make_driver(**_login_settings())
+    driver.storage_state = {"cookies": [], "origins": []}
+    driver.browser = _mock_browser("https://pocketoption.com/en/cabinet/")
+    
+    await driver.login()
+    
+    page = driver.browser.new_context.return_value.new_page.return_value
+    page.click.assert_not_called()
+    page.goto.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_async_login_missing_settings():
+    """Test that missing login settings fail before the browser is launched."""
+    driver = _make_driver()
+    driver.start = AsyncMock()
+    
+    with pytest.raises(RuntimeError, match="Missing required UI settings"):
+        await driver.login()
+    
+    driver.start.assert_not_called()
+
+
+def _trade_settings(**overrides) -> dict:
+    values = {
+        "selector_asset_field": "#asset",
+        "selector_duration_field": "#duration",
+        "selector_stake_field": "#stake",
+        "selector_direction_up": "#up",
+        "selector_direction_down": "#down",
+    }
+    values.update(overrides)
+    return values
+
+
+@pytest.mark.asyncio
+async def test_start_attaches_over_cdp_and_reuses_profile_context():
+    """Test that cdp_endpoint attaches to a running browser and flows share its profile context."""
+    driver = _make_driver(cdp_endpoint="http://127.0.0.1:9222")
+    profile_context = _mock_context("https://pocketoption.com/en/cabinet/")
+    browser = _mock_browser("https://pocketoption.com/en/cabinet/")
+    browser.contexts = [profile_context]
+    playwright = MagicMock()
+    playwright.chromium.connect_over_cdp = AsyncMock(return_value=browser)
+    playwright.stop = AsyncMock()
+    
+    await driver.start(playwright)
+    async with driver._flow_page() as page:
+        assert page is profile_context.new_page.return_value
+    await driver.close()
+    
+    playwright.chromium.connect_over_cdp.assert_awaited_once_with("http://127.0.0.1:9222")
+    playwright.chromium.launch.assert_not_called()
+    browser.new_context.assert_not_called()
+    page.close.assert_awaited_once()
+    profile_context.close.assert_not_called()
+    browser.close.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_start_uses_persistent_profile_when_configured(tmp_path):
+    """Test that user_data_dir launches one persistent context shared by all flows."""
+    driver = _make_driver(user_data_dir=str(tmp_path / "profile"))
+    profile_context = _mock_context("https://pocketoption.com/en/cabinet/")
+    playwright = MagicMock()
+    playwright.chromium.launch_persistent_context = AsyncMock(return_value=profile_context)
+    playwright.stop = AsyncMock()
+    
+    await driver.start(playwright)
+    async with driver._flow_page():
+        pass
+    async with driver._flow_page():
+        pass
+    
+    playwright.chromium.launch.assert_not_called()
+    assert profile_context.new_page.await_count == 2
+    profile_context.close.assert_not_called()
+    
+    await driver.close()
+    profile_context.close.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_trade_over_cdp_leaves_daemon_context_open():
+    """Test that a CDP trade blocks resources on its own page and leaves the profile context alone."""
+    driver = _make_driver(**_trade_settings(cdp_endpoint="http://127.0.0.1:9222", block_resources=True))
+    profile_context = _mock_context("https://pocketoption.com/en/cabinet/")
+    driver.browser = MagicMock(contexts=[profile_context])
+    
+    with patch("app.ui_driver.async_playwright_driver.expect", return_value=MagicMock(to_have_value=AsyncMock())):
+        await driver.place_entry_trade("GBP/USD OTC", 5, PocketOptionDirection.UP, 1.0)
+    
+    page = profile_context.new_page.return_value
+    page.route.assert_awaited_once()
+    page.click.assert_any_await("#up")
+    page.close.assert_awaited_once()
+    profile_context.route.assert_not_called()
+    profile_context.close.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_trade_closes_owned_context():
+    """Test that a trade opens its own context with the storage state and closes it afterwards."""
+    driver = _make_driver(**_trade_settings(block_resources=False))
+    driver.storage_state = {"cookies": [], "origins": []}
+    driver.browser = _mock_browser("https://pocketoption.com/en/cabinet/")
+    
+    with patch("app.ui_driver.async_playwright_driver.expect", return_value=MagicMock(to_have_value=AsyncMock())):
+        await driver.place_entry_trade("GBP/USD OTC", 5, PocketOptionDirection.DOWN, 1.0)
+    
+    driver.browser.new_context.assert_awaited_once_with(storage_state={"cookies": [], "origins": []})
+    context = driver.browser.new_context.return_value
+    page = context.new_page.return_value
+    page.route.assert_not_called()
+    page.click.assert_any_await("#down")
+    page.close.assert_awaited_once()
+    context.close.assert_awaited_once()
@@ -1,28 +1,135 @@
-"""Tests for UI driver auth storage state."""
+"""Tests for UI driver auth storage state handling."""
 
-from unittest.mock import patch
+import json
+import os
+import time
+from unittest.mock import AsyncMock, MagicMock, patch
 
-from app.config import get_settings
+import pytest
+
+from app.config import PocketOptionBotConfig, get_settings
+from app.models.pocketoption import PocketOptionDirection
+from app.ui_driver.async_playwright_driver import AsyncPocketOptionUIDriver, load_auth_state, save_auth_state
 from app.ui_driver.playwright_driver import PocketOptionUIDriver
 
 
-def test_auth_storage_state_default_none():
+@pytest.fixture(scope="session")
+def settings() -> PocketOptionBotConfig:
+    """Environment-derived settings, shared by tests that do not mutate config."""
+    return get_settings()
+
+
+def _login_settings(**overrides) -> PocketOptionBotConfig:
+    values = {
+        "login_url": "https://pocketoption.com/en/login/",
+        "username": "user@example.com",
+        "password": "secret",
+        "selector_username": "#email",
+        "selector_password": "#password",
+        "selector_login_button": "#login",
+    }
+    values.update(overrides)
+    return PocketOptionBotConfig(**values)
+
+
+def test_auth_storage_state_default_none(settings):
     """Test that _auth_storage_state defaults to None."""
-    # Mock Playwright to avoid requiring actual installation
-    with patch("app.ui_driver.playwright_driver.SYNC_PLAYWRIGHT") as mock_playwright:
-        # Create a mock playwright context
-        mock_p = mock_playwright.return_value.__enter__.return_value
-        mock_browser = mock_p.chromium.launch.return_value
-        mock_context = mock_browser.new_context.return_value
-        mock_page = mock_context.new_page.return_value
+    with patch("app.ui_driver.playwright_driver.ASYNC_PLAYWRIGHT", MagicMock()):
+        driver = PocketOptionUIDriver(settings)
+    
+    assert driver._auth_storage_state is None
+
+
+@pytest.mark.asyncio
+async def test_auth_storage_state_persisted_and_reloaded(tmp_path):
+    """Test that captured auth state is written to auth_state_path and loaded by new drivers."""
+    state_path = tmp_path / "state" / "auth.json"
+    settings = PocketOptionBotConfig(auth_state_path=str(state_path))
+    state = {"cookies": [{"name": "session", "value": "abc"}], "origins": []}
+    page = MagicMock(url="https://pocketoption.com/en/cabinet/", goto=AsyncMock())
+    page.context.storage_state = AsyncMock(return_value=state)
+    
+    with patch("app.ui_driver.async_playwright_driver.ASYNC_PLAYWRIGHT", MagicMock()):
+        driver = AsyncPocketOptionUIDriver(settings)
+        assert driver.storage_state is None
         
-        settings = get_settings()
+        await driver._capture_auth_state(page)
         
-        # This will fail if Playwright is not installed, but we're mocking it
-        try:
-            driver = PocketOptionUIDriver(settings)
-            assert driver._auth_storage_state is None
-        except RuntimeError:
-            # If Playwright is not installed, skip this test
-            pass
+        assert json.loads(state_path.read_text(encoding="utf-8")) == state
+        
+        reloaded = AsyncPocketOptionUIDriver(settings)
+        assert reloaded.storage_state == state
+        assert await reloaded.needs_login(page) is False
+
 
+def test_saved_auth_state_is_private_and_replaced_atomically(tmp_path):
+    """Test that the auth state file is owner-only and no temp file is left behind."""
+    state_path = tmp_path / "auth.json"
+    state_path.write_text("old", encoding="utf-8")
+    
+    save_auth_state(PocketOptionBotConfig(auth_state_path=str(state_path)), {"cookies": [], "origins": []})
+    
+    assert json.loads(state_path.read_text(encoding="utf-8")) == {"cookies": [], "origins": []}
+    assert state_path.stat().st_mode & 0o777 == 0o600
+    assert [p.name for p in tmp_path.iterdir()] == ["auth.json"]
+
+
+def test_stale_auth_storage_state_is_ignored(tmp_path):
+    """Test that a persisted auth state older than the max age is not reused."""
+    state_path = tmp_path / "auth.json"
+    state_path.write_text(json.dumps({"cookies": [], "origins": []}), encoding="utf-8")
+    stale = time.time() - 3 * 3600
+    os.utime(state_path, (stale, stale))
+    
+    assert load_auth_state(PocketOptionBotConfig(auth_state_path=str(state_path), auth_state_max_age_hours=2)) is None
+    assert load_auth_state(PocketOptionBotConfig(auth_state_path=str(state_path), auth_state_max_age_hours=4)) is not None
+
+
+@pytest.mark.asyncio
+async def test_reused_auth_state_is_not_rewritten(tmp_path):
+    """Test that skipping the login form does not refresh the persisted state's age."""
+    state_path = tmp_path / "auth.json"
+    state_path.write_text(json.dumps({"cookies": [], "origins": []}), encoding="utf-8")
+    saved_at = time.time() - 3600
+    os.utime(state_path, (saved_at, saved_at))
+    browser = MagicMock()
+    context = AsyncMock()
+    browser.new_context = AsyncMock(return_value=context)
+    
+    with patch("app.ui_driver.async_playwright_driver.ASYNC_PLAYWRIGHT", MagicMock()), \
+            patch.object(AsyncPocketOptionUIDriver, "needs_login", AsyncMock(return_value=False)):
+        driver = AsyncPocketOptionUIDriver(_login_settings(auth_state_path=str(state_path)))
+        driver.browser = browser
+        await driver.login()
+    
+    assert state_path.stat().st_mtime == saved_at
+    context.new_page.return_value.close.assert_awaited_once()
+
+
+def test_sync_driver_carries_auth_state_between_flows():
+    """Test that each sync flow runs on a fresh async driver, seeded with the last captured state."""
+    state = {"cookies": [{"name": "session", "value": "abc"}], "origins": []}
+    created = []
+    
+    def fake_driver(settings, storage_state=None):
+        driver = MagicMock(storage_state=storage_state, close=AsyncMock())
+        
+        async def login():
+            driver.storage_state = state
+        
+        driver.login = login
+        driver.place_entry_trade = AsyncMock()
+        created.append(driver)
+        return driver
+    
+    with patch("app.ui_driver.playwright_driver.ASYNC_PLAYWRIGHT", MagicMock()), \
+            patch("app.ui_driver.playwright_driver.AsyncPocketOptionUIDriver", side_effect=fake_driver):
+        driver = PocketOptionUIDriver(_login_settings())
+        driver.login()
+        driver.place_entry_trade("GBP/USD OTC", 5, PocketOptionDirection.UP, 1.0)
+    
+    assert len(created) == 2
+    assert created[1].storage_state is state
+    created[1].place_entry_trade.assert_awaited_once_with("GBP/USD OTC", 5, PocketOptionDirection.UP, 1.0)
+    for flow_driver in created:
+        flow_driver.close.assert_awaited_once()
@@ -0,0 +1,100 @@
+"""Tests for UI driver precomputed settings and page helpers."""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.config import PocketOptionBotConfig
+from app.models.pocketoption import PocketOptionDirection
+from app.ui_driver.async_playwright_driver import (
+    AsyncPocketOptionUIDriver,
+    _route_block_heavy_resources,
+    _stake_pattern,
+)
+from app.ui_driver.playwright_driver import PocketOptionUIDriver
+
+
+def test_duration_presets_merge_settings_overrides():
+    """Test that configured presets extend the built-in duration table."""
+    with patch("app.ui_driver.async_playwright_driver.ASYNC_PLAYWRIGHT", MagicMock()):
+        driver = AsyncPocketOptionUIDriver(PocketOptionBotConfig(duration_presets={3: "M3", 5: "5m"}))
+    
+    assert driver._duration_presets[1] == "M1"
+    assert driver._duration_presets[3] == "M3"
+    assert driver._duration_presets[5] == "5m"
+
+
+def test_missing_trade_selectors_detected_at_init():
+    """Test that missing trading selectors are resolved once and reported by place_entry_trade."""
+    mock_playwright = MagicMock()
+    with patch("app.ui_driver.async_playwright_driver.ASYNC_PLAYWRIGHT", mock_playwright), \
+            patch("app.ui_driver.playwright_driver.ASYNC_PLAYWRIGHT", mock_playwright):
+        settings = PocketOptionBotConfig(selector_asset_field="#asset")
+        missing = AsyncPocketOptionUIDriver(settings)._missing_trade_selectors
+        
+        assert "POCKETOPTION_SELECTOR_ASSET_FIELD" not in missing
+        assert "POCKETOPTION_SELECTOR_STAKE_FIELD" in missing
+        
+        with pytest.raises(RuntimeError, match="Missing required trading selectors"):
+            PocketOptionUIDriver(settings).place_entry_trade("GBP/USD OTC", 5, PocketOptionDirection.DOWN, 1.0)
+    
+    mock_playwright.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_route_handler_blocks_heavy_resources():
+    """Test that images/fonts/media are aborted and other requests continue."""
+    image_route = AsyncMock()
+    image_route.request.resource_type = "image"
+    await _route_block_heavy_resources(image_route)
+    image_route.abort.assert_awaited_once()
+    image_route.continue_.assert_not_called()
+    
+    script_route = AsyncMock()
+    script_route.request.resource_type = "script"
+    await _route_block_heavy_resources(script_route)
+    script_route.continue_.assert_awaited_once()
+    script_route.abort.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_fill_stake_falls_back_to_key_presses():
+    """Test that a dropped fill is retried with press_sequentially."""
+    stake_locator = AsyncMock()
+    assertion = MagicMock()
+    assertion.to_have_value = AsyncMock(side_effect=[AssertionError("value not applied"), None])
+    
+    with patch("app.ui_driver.async_playwright_driver.expect", return_value=assertion):
+        await AsyncPocketOptionUIDriver._fill_stake(stake_locator, "1.0")
+    
+    stake_locator.press_sequentially.assert_awaited_once_with("1.0", delay=10)
+
+
+@pytest.mark.asyncio
+async def test_fill_stake_fast_path():
+    """Test that a verified fill does not type key by key."""
+    stake_locator = AsyncMock()
+    assertion = MagicMock(to_have_value=AsyncMock())
+    
+    with patch("app.ui_driver.async_playwright_driver.expect", return_value=assertion):
+        await AsyncPocketOptionUIDriver._fill_stake(stake_locator, "1.0")
+    
+    stake_locator.fill.assert_awaited_once_with("1.0")
+    stake_locator.press_sequentially.assert_not_called()
+
+
+@pytest.mark.parametrize(
+    ("value", "shown", "matches"),
+    [
+        ("1.0", "1", True),
+        ("1.0", "1.00", True),
+        ("1.5", "1.50", True),
+        ("10", "10.0", True),
+        ("1.0", "10", False),
+        ("1.5", "1.05", False),
+        ("1.0", "11.0", False),
+    ],
+)
+def test_stake_pattern_accepts_reformatted_values(value, shown, matches):
+    """Test that the stake check tolerates reformatting but not a different amount."""
+    assert bool(_stake_pattern(value).match(shown)) is matches
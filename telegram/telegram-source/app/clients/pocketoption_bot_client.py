@@ -1,7 +1,11 @@
 """HTTP client for PocketOption bot API."""
 
+import asyncio
+import random
+
 import httpx
-from typing import Optional
+import orjson
+from typing import Dict, List, Optional
 
 from app.config import TelegramSourceConfig
 from app.models.pocketoption import PocketOptionSignal
@@ -9,6 +13,31 @@ from app.logging_config import get_logger
 
 logger = get_logger("pocketoption-bot-client")
 
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
+# Connection failures are retried by the transport (the request never reached the bot).
+# 502/503 (the bot was unreachable or unavailable) are retried with jittered exponential
+# backoff. Read timeouts and 504 are NOT retried: the bot may already have placed the trade.
+_CONNECT_RETRIES = 2
+_RETRY_STATUS_CODES = frozenset({502, 503})
+_MAX_ATTEMPTS = 3
+_BACKOFF_INITIAL = 0.1
+_BACKOFF_MAX = 1.0
+
+# Pending signals awaiting the background sender; place_trade waits only when full.
+_QUEUE_MAXSIZE = 64
+
+
+def _encode(signals: List[PocketOptionSignal]) -> bytes:
+    """
+    Encode one signal as an object, or several as an array.
+    
+    orjson serializes the (slotted) PocketOptionSignal dataclass natively, field
+    by field in C, so the dataclass fields are the wire schema; the str enums
+    are written as their values (direction is normalized on the bot side).
+    """
+    return orjson.dumps(signals[0] if len(signals) == 1 else signals)
+
 
 class PocketOptionBotClient:
     """Client for sending PocketOption signals to the bot API."""
@@ -22,82 +51,207 @@ class PocketOptionBotClient:
         """
         self.config = config
         self.timeout = 5.0
+        bot_url = config.pocketoption_bot_url.rstrip("/") if config.pocketoption_bot_url else None
+        self._place_trade_url: Optional[str] = f"{bot_url}/place_trade" if bot_url else None
+        self._place_trade_batch_url: Optional[str] = f"{bot_url}/place_trade_batch" if bot_url else None
+        # Signals queued within the batching window are coalesced into one POST
+        self._batch_max = max(1, config.bot_batch_max)
+        self._batch_window = config.bot_batch_window_ms / 1000
+        # Shared client so consecutive signals reuse pooled keep-alive connections
+        self._client: Optional[httpx.AsyncClient] = None
+        # The config is frozen, so pick the place_trade implementation once
+        if not bot_url:
+            self.place_trade = self._skip_trade
+        elif config.dry_run:
+            self.place_trade = self._log_dry_run_trade
+        # Signals are posted by one background worker (started on first use, since
+        # there is no running loop at construction time), preserving signal order
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+    
+    def _get_client(self) -> httpx.AsyncClient:
+        """Return the shared HTTP client, creating it on first use."""
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout,
+                headers=_JSON_HEADERS,
+                limits=httpx.Limits(
+                    max_keepalive_connections=10, max_connections=20, keepalive_expiry=60
+                ),
+                transport=httpx.AsyncHTTPTransport(retries=_CONNECT_RETRIES),
+            )
+        return self._client
+    
+    async def aclose(self) -> None:
+        """Send any queued signals, stop the background worker and close the HTTP client."""
+        if self._worker is not None:
+            await self._queue.join()
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+            self._queue = None
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+    
+    async def __aenter__(self) -> "PocketOptionBotClient":
+        return self
+    
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+    
+    async def _post_with_retry(
+        self, url: str, body: bytes, log_extra: Dict, timeout: float
+    ) -> httpx.Response:
+        """POST the encoded signal(s), retrying gateway errors with jittered backoff."""
+        client = self._get_client()
+        for attempt in range(1, _MAX_ATTEMPTS + 1):
+            response = await client.post(url, content=body, timeout=timeout)
+            if response.status_code not in _RETRY_STATUS_CODES or attempt == _MAX_ATTEMPTS:
+                return response
+            delay = min(_BACKOFF_MAX, _BACKOFF_INITIAL * 2 ** (attempt - 1))
+            delay += random.uniform(0, _BACKOFF_INITIAL)
+            logger.warning(
+                "PocketOption bot unavailable, retrying",
+                extra={
+                    **log_extra,
+                    "status_code": response.status_code,
+                    "attempt": attempt,
+                    "delay": round(delay, 3),
+                },
+            )
+            await asyncio.sleep(delay)
+        return response
+    
+    async def _next_batch(self) -> List[PocketOptionSignal]:
+        """Wait for a signal, then collect more until the batch is full or the window closes."""
+        batch = [await self._queue.get()]
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self._batch_window
+        while len(batch) < self._batch_max:
+            if not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+                continue
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+        return batch
+    
+    async def _drain(self) -> None:
+        """Post queued signals in order, batch by batch, until cancelled."""
+        while True:
+            batch = await self._next_batch()
+            try:
+                await self._send(batch)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+    
+    async def _skip_trade(self, signal: PocketOptionSignal) -> None:
+        """place_trade() when POCKETOPTION_BOT_URL is not configured."""
+        logger.info(
+            "POCKETOPTION_BOT_URL not configured, skipping HTTP call",
+            extra={"signal_type": signal.signal_type}
+        )
+    
+    async def _log_dry_run_trade(self, signal: PocketOptionSignal) -> None:
+        """place_trade() in DRY-RUN mode."""
+        logger.info(
+            "DRY-RUN mode: would send signal to PocketOption bot",
+            extra={
+                "signal_type": signal.signal_type,
+                "signal_asset": signal.asset,
+                "signal_duration_minutes": signal.duration_minutes,
+                "signal_direction": signal.direction,
+                "signal_amount_multiplier": signal.amount_multiplier,
+                "bot_url": self.config.pocketoption_bot_url,
+            }
+        )
     
     async def place_trade(self, signal: PocketOptionSignal) -> None:
         """
-        Send a PocketOption signal to the bot API.
+        Queue a PocketOption signal for sending to the bot API.
+        
+        Returns as soon as the signal is queued, so a slow bot does not stall
+        Telegram update processing. Only waits if the queue is full.
+        Without a bot URL, or in DRY-RUN mode, __init__ rebinds this to
+        _skip_trade / _log_dry_run_trade, which only log.
         
         Args:
             signal: PocketOptionSignal to send
         """
-        if not self.config.pocketoption_bot_url:
-            logger.info(
-                "POCKETOPTION_BOT_URL not configured, skipping HTTP call",
-                extra={"signal_type": signal.signal_type.value}
-            )
-            return
-        
-        if self.config.dry_run:
-            logger.info(
-                "DRY-RUN mode: would send signal to PocketOption bot",
-                extra={
-                    "signal_type": signal.signal_type.value,
-                    "signal_asset": signal.asset,
-                    "signal_duration_minutes": signal.duration_minutes,
-                    "signal_direction": signal.direction.value if signal.direction else None,
-                    "signal_amount_multiplier": signal.amount_multiplier,
-                    "bot_url": self.config.pocketoption_bot_url,
-                }
-            )
-            return
-        
-        # Prepare JSON payload matching new schema
-        # Direction should be sent as string (will be normalized on bot side)
-        direction_str = None
-        if signal.direction:
-            direction_str = signal.direction.value
+        if self._worker is None:
+            self._queue = asyncio.Queue(maxsize=_QUEUE_MAXSIZE)
+            self._worker = asyncio.create_task(self._drain())
+        await self._queue.put(signal)
+    
+    async def _send(self, signals: List[PocketOptionSignal]) -> None:
+        """
+        POST signals to the bot API, logging (not raising) failures.
         
-        payload = {
-            "signal_type": signal.signal_type.value,
-            "asset": signal.asset,
-            "duration_minutes": signal.duration_minutes,
-            "direction": direction_str,
-            "amount_multiplier": signal.amount_multiplier,
-            "raw_message_id": signal.raw_message_id,
-            "raw_channel_id": signal.raw_channel_id,
-            "raw_text": signal.raw_text,
-        }
+        A single signal goes to /place_trade; several go to /place_trade_batch
+        as a JSON array, answered with one TradeResult per signal. The bot
+        executes a batch sequentially, so the timeout scales with its size.
+        If the bot refuses the batch size (413: its POCKETOPTION_MAX_BATCH_SIZE
+        is below bot_batch_max), the signals are re-sent one by one.
         
-        url = f"{self.config.pocketoption_bot_url.rstrip('/')}/place_trade"
+        Args:
+            signals: PocketOptionSignals to send, in order
+        """
+        if len(signals) == 1:
+            url = self._place_trade_url
+            log_extra = {"signal_type": signals[0].signal_type}
+        else:
+            url = self._place_trade_batch_url
+            log_extra = {
+                "signal_type": ",".join(signal.signal_type for signal in signals),
+                "batch_size": len(signals),
+            }
         
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.post(url, json=payload)
-                response.raise_for_status()
-                logger.info(
-                    "Successfully sent signal to PocketOption bot",
-                    extra={
-                        "signal_type": signal.signal_type.value,
-                        "status_code": response.status_code,
-                    }
+            response = await self._post_with_retry(
+                url, _encode(signals), log_extra, timeout=self.timeout * len(signals)
+            )
+            if response.status_code == 413 and len(signals) > 1:
+                logger.warning(
+                    "PocketOption bot refused batch size, sending signals one by one",
+                    extra={**log_extra, "status_code": response.status_code},
                 )
-        except httpx.HTTPError as e:
-            logger.error(
-                "Failed to send signal to PocketOption bot",
+                for signal in signals:
+                    await self._send([signal])
+                return
+            response.raise_for_status()
+            logger.info(
+                "Successfully sent signal to PocketOption bot",
                 extra={
-                    "signal_type": signal.signal_type.value,
-                    "error": str(e),
-                    "error_type": type(e).__name__,
-                },
-                exc_info=True,
+                    **log_extra,
+                    "status_code": response.status_code,
+                }
             )
+            if len(signals) > 1:
+                for signal, result in zip(signals, orjson.loads(response.content)):
+                    if result.get("status") == "error":
+                        logger.error(
+                            "PocketOption bot rejected signal",
+                            extra={
+                                "signal_type": signal.signal_type,
+                                "message_id": signal.raw_message_id,
+                                "reason": result.get("reason"),
+                            },
+                        )
         except Exception as e:
-            logger.error(
-                "Unexpected error while sending signal to PocketOption bot",
-                extra={
-                    "signal_type": signal.signal_type.value,
-                    "error": str(e),
-                    "error_type": type(e).__name__,
-                },
-                exc_info=True,
-            )
+            if isinstance(e, httpx.HTTPError):
+                msg = "Failed to send signal to PocketOption bot"
+            else:
+                msg = "Unexpected error while sending signal to PocketOption bot"
+            log_extra["error"] = str(e)
+            log_extra["error_type"] = type(e).__name__
+            logger.error(msg, extra=log_extra)
+            logger.debug(msg, exc_info=True)
@@ -1,54 +1,79 @@
 """Configuration for telegram-source service."""
 
 import os
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Optional
 
-from pydantic import BaseModel, Field, field_validator
+# Fields given as strings by env-style callers and coerced to int
+_INT_FIELDS = ("api_id", "bot_batch_max", "bot_batch_window_ms")
 
+# Accepted type(s) per field, checked after coercion
+_FIELD_TYPES = (
+    ("api_id", int),
+    ("api_hash", str),
+    ("account_id", str),
+    ("pocketoption_channel_id", (str, int)),
+    ("session_dir", Path),
+    ("pocketoption_bot_url", (str, type(None))),
+    ("dry_run", bool),
+    ("bot_batch_max", int),
+    ("bot_batch_window_ms", int),
+)
 
-class TelegramSourceConfig(BaseModel):
-    """Telegram source service configuration."""
-    api_id: int = Field(..., description="Telegram API ID")
-    api_hash: str = Field(..., description="Telegram API hash")
-    account_id: str = Field(..., description="Telegram account identifier (e.g., ta01)")
-    pocketoption_channel_id: str | int = Field(..., description="PocketOption channel ID")
-    session_dir: Path = Field(default=Path("/app/telegram/sessions"), description="Session directory path")
-    pocketoption_bot_url: Optional[str] = Field(default=None, description="PocketOption bot HTTP API URL")
-    dry_run: bool = Field(default=True, description="Enable DRY-RUN mode (no actual HTTP calls)")
-
-    @field_validator("api_id", mode="before")
-    @classmethod
-    def parse_api_id(cls, v):
-        """Parse API ID from string if needed."""
-        if isinstance(v, str):
-            return int(v)
-        return v
 
-    @field_validator("pocketoption_channel_id", mode="before")
-    @classmethod
-    def parse_channel_id(cls, v):
-        """Parse channel ID, keeping as string or int."""
-        if isinstance(v, str) and v.lstrip("-").isdigit():
-            return int(v)
-        return v
-
-    @field_validator("session_dir", mode="before")
-    @classmethod
-    def parse_session_dir(cls, v):
-        """Parse session directory path."""
-        if isinstance(v, str):
-            return Path(v)
-        return v
+@dataclass(slots=True, frozen=True)
+class TelegramSourceConfig:
+    """Telegram source service configuration."""
+    api_id: int  # Telegram API ID
+    api_hash: str  # Telegram API hash
+    account_id: str  # Telegram account identifier (e.g., ta01)
+    pocketoption_channel_id: str | int  # PocketOption channel ID
+    session_dir: Path = Path("/app/telegram/sessions")  # Session directory path
+    pocketoption_bot_url: Optional[str] = None  # PocketOption bot HTTP API URL
+    dry_run: bool = True  # Enable DRY-RUN mode (no actual HTTP calls)
+    bot_batch_max: int = 16  # Max signals coalesced into one bot POST (keep <= the bot's POCKETOPTION_MAX_BATCH_SIZE)
+    bot_batch_window_ms: int = 20  # Window (ms) to coalesce signals into one bot POST
+    session_file: Path = field(init=False)  # Session file path (derived)
 
-    @property
-    def session_file(self) -> Path:
-        """Get session file path."""
-        return self.session_dir / f"session_{self.account_id}.session"
+    def __post_init__(self) -> None:
+        """
+        Coerce string IDs/paths and validate field types.
+        
+        Raises:
+            ValueError: If a field cannot be coerced or has the wrong type
+        """
+        # Frozen dataclass: normalized values are set via object.__setattr__
+        for name in _INT_FIELDS:
+            value = getattr(self, name)
+            if isinstance(value, str):
+                try:
+                    object.__setattr__(self, name, int(value))
+                except ValueError:
+                    raise ValueError(f"{name} must be an integer, got {value!r}") from None
+        # Numeric channel IDs (e.g. -100...) become int; usernames stay str
+        channel_id = self.pocketoption_channel_id
+        if isinstance(channel_id, str) and channel_id.lstrip("-").isdigit():
+            object.__setattr__(self, "pocketoption_channel_id", int(channel_id))
+        if isinstance(self.session_dir, str):
+            object.__setattr__(self, "session_dir", Path(self.session_dir))
+        
+        for name, expected in _FIELD_TYPES:
+            value = getattr(self, name)
+            # bool is an int subclass, but True is not a valid ID or size
+            if not isinstance(value, expected) or (expected is int and isinstance(value, bool)):
+                raise ValueError(f"{name} has invalid type {type(value).__name__}")
+        
+        object.__setattr__(self, "session_file", self.session_dir / f"session_{self.account_id}.session")
 
     @classmethod
     def from_env(cls) -> "TelegramSourceConfig":
-        """Load configuration from environment variables."""
+        """
+        Load configuration from environment variables.
+        
+        Not cached: the environment is read on every call, and the service
+        calls this once at startup.
+        """
         api_id = os.getenv("TELEGRAM_API_ID")
         if not api_id:
             raise ValueError("TELEGRAM_API_ID environment variable is required")
@@ -68,15 +93,19 @@ class TelegramSourceConfig(BaseModel):
         session_dir = os.getenv("TELEGRAM_SESSION_DIR", "/app/telegram/sessions")
         bot_url = os.getenv("POCKETOPTION_BOT_URL")
         dry_run = os.getenv("POCKETOPTION_DRY_RUN", "true").lower() in ("true", "1", "yes")
+        batch_max = os.getenv("POCKETOPTION_BOT_BATCH_MAX", "16")
+        batch_window_ms = os.getenv("POCKETOPTION_BOT_BATCH_WINDOW_MS", "20")
 
         return cls(
-            api_id=int(api_id),
+            api_id=api_id,
             api_hash=api_hash,
             account_id=account_id,
             pocketoption_channel_id=channel_id,
-            session_dir=Path(session_dir),
+            session_dir=session_dir,
             pocketoption_bot_url=bot_url,
             dry_run=dry_run,
+            bot_batch_max=batch_max,
+            bot_batch_window_ms=batch_window_ms,
         )
 
 
@@ -8,7 +8,7 @@ from telethon import TelegramClient
 
 from app.config import TelegramSourceConfig
 from app.logging_config import get_logger
-from app.parsers.pocketoption import PocketOptionParser
+from app.parsers.pocketoption import parse as parse_pocketoption
 
 logger = get_logger("debug-recent")
 
@@ -86,37 +86,38 @@ async def debug_recent() -> None:
         # Reverse to show oldest first
         messages = list(reversed(messages))
         
-        parser = PocketOptionParser()
-        
+        # Collect output and write it once instead of one print() per line
+        lines = []
         for idx, message in enumerate(messages, 1):
             msg_id = message.id
             raw_text = message.text or "(no text)"
             
             # Parse the message
-            signal = parser.parse(message)
+            signal = parse_pocketoption(message)
             
             # Print result
-            print(f"\n[{idx}/10] msg_id={msg_id} RAW=\"{raw_text[:60]}{'...' if len(raw_text) > 60 else ''}\"")
+            preview = raw_text if len(raw_text) <= 60 else raw_text[:60] + "..."
+            lines.append(f"\n[{idx}/10] msg_id={msg_id} RAW=\"{preview}\"")
             
             if signal is None:
-                print("  -> IGNORED (no signal)")
+                lines.append("  -> IGNORED (no signal)")
             else:
                 # Format signal details
-                details = []
-                details.append(f"type={signal.signal_type.value}")
+                details = [f"type={signal.signal_type}"]
                 if signal.asset:
                     details.append(f"asset=\"{signal.asset}\"")
                 if signal.duration_minutes is not None:
                     details.append(f"duration_minutes={signal.duration_minutes}")
                 if signal.direction:
-                    details.append(f"direction={signal.direction.value}")
+                    details.append(f"direction={signal.direction}")
                 if signal.amount_multiplier is not None:
                     details.append(f"amount_multiplier={signal.amount_multiplier}")
                 
-                print(f"  -> SIGNAL {' '.join(details)}")
+                lines.append(f"  -> SIGNAL {' '.join(details)}")
         
-        print("\n" + "=" * 80)
-        print(f"Total messages processed: {len(messages)}")
+        lines.append("\n" + "=" * 80)
+        lines.append(f"Total messages processed: {len(messages)}")
+        sys.stdout.write("\n".join(lines) + "\n")
         logger.info("Debug recent completed", extra={"message_count": len(messages)})
         
     except Exception as e:
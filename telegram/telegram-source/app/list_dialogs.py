@@ -1,8 +1,10 @@
 """List all Telegram dialogs/channels for the configured account."""
 
+import argparse
 import asyncio
 import sys
 from pathlib import Path
+from typing import Optional
 
 from telethon import TelegramClient
 from telethon.tl.types import Channel, Chat, User
@@ -11,6 +13,20 @@ from app.logging_config import get_logger
 
 logger = get_logger("list-dialogs")
 
+DEFAULT_LIMIT = 500
+DIALOG_TYPES = ("channel", "supergroup", "group", "user")
+
+
+def _dialog_type(entity) -> str:
+    """Classify a dialog entity as channel / supergroup / group / user."""
+    if isinstance(entity, Channel):
+        return "supergroup" if entity.megagroup else "channel"
+    if isinstance(entity, Chat):
+        return "group"
+    if isinstance(entity, User):
+        return "user"
+    return "unknown"
+
 
 def load_config_for_listing():
     """Load minimal config for listing dialogs (channel_id not required)."""
@@ -39,8 +55,19 @@ def load_config_for_listing():
     }
 
 
-async def list_dialogs() -> None:
-    """List all dialogs/channels for the configured Telegram account."""
+async def list_dialogs(
+    limit: Optional[int] = DEFAULT_LIMIT,
+    include_archived: bool = True,
+    dialog_type: Optional[str] = None,
+) -> None:
+    """
+    List dialogs/channels for the configured Telegram account.
+    
+    Args:
+        limit: Maximum number of dialogs to fetch (None for all)
+        include_archived: Also list archived dialogs
+        dialog_type: Only print dialogs of this type (see DIALOG_TYPES)
+    """
     try:
         config = load_config_for_listing()
     except ValueError as e:
@@ -92,24 +119,19 @@ async def list_dialogs() -> None:
         print(f"Listing dialogs for: {me.first_name} {me.last_name or ''} (@{me.username or 'no username'})".strip())
         print("=" * 80)
         
-        # Iterate over all dialogs
+        # Iterate over dialogs; archived ones live in folder 1 and are skipped on request
         dialog_count = 0
-        async for dialog in client.iter_dialogs():
-            dialog_count += 1
-            
-            # Determine dialog type
+        fetched_count = 0
+        async for dialog in client.iter_dialogs(
+            limit=limit,
+            archived=None if include_archived else False,
+        ):
+            fetched_count += 1
             entity = dialog.entity
-            if isinstance(entity, Channel):
-                if entity.megagroup:
-                    dialog_type = "supergroup"
-                else:
-                    dialog_type = "channel"
-            elif isinstance(entity, Chat):
-                dialog_type = "group"
-            elif isinstance(entity, User):
-                dialog_type = "user"
-            else:
-                dialog_type = "unknown"
+            entity_type = _dialog_type(entity)
+            if dialog_type and entity_type != dialog_type:
+                continue
+            dialog_count += 1
             
             # Get dialog ID (peer ID)
             dialog_id = dialog.id
@@ -124,11 +146,18 @@ async def list_dialogs() -> None:
             
             # Print in readable format
             username_str = f"@{username}" if username else "N/A"
-            print(f"ID={dialog_id} | TYPE={dialog_type} | TITLE=\"{title}\" | USERNAME={username_str}")
+            print(f"ID={dialog_id} | TYPE={entity_type} | TITLE=\"{title}\" | USERNAME={username_str}")
         
         print("=" * 80)
-        print(f"Total dialogs: {dialog_count}")
-        logger.info("Listed all dialogs", extra={"count": dialog_count})
+        truncated = limit is not None and fetched_count >= limit
+        if truncated:
+            print(f"Total dialogs: {dialog_count} (limit reached: showing the first {limit}; use --limit 0 for all)")
+        else:
+            print(f"Total dialogs: {dialog_count}")
+        logger.info(
+            "Listed dialogs",
+            extra={"count": dialog_count, "limit": limit, "truncated": truncated},
+        )
         
     except Exception as e:
         error_msg = f"Error listing dialogs: {e}"
@@ -141,8 +170,24 @@ async def list_dialogs() -> None:
 
 def main() -> None:
     """Main entry point."""
+    parser = argparse.ArgumentParser(description="List Telegram dialogs for the configured account")
+    parser.add_argument(
+        "--limit",
+        type=int,
+        default=DEFAULT_LIMIT,
+        help=f"Maximum dialogs to fetch, 0 for all (default: {DEFAULT_LIMIT})",
+    )
+    parser.add_argument(
+        "--archived",
+        action=argparse.BooleanOptionalAction,
+        default=True,
+        help="Include archived dialogs (default: yes; --no-archived skips them)",
+    )
+    parser.add_argument("--filter", choices=DIALOG_TYPES, help="Only list dialogs of this type")
+    args = parser.parse_args()
+    
     try:
-        asyncio.run(list_dialogs())
+        asyncio.run(list_dialogs(args.limit or None, args.archived, args.filter))
     except KeyboardInterrupt:
         print("\nListing cancelled by user", file=sys.stderr)
         sys.exit(1)
@@ -1,6 +1,7 @@
 """Main entry point for telegram-source service."""
 
 import asyncio
+import logging
 import signal
 import sys
 from typing import Optional
@@ -8,9 +9,15 @@ from typing import Optional
 from telethon import TelegramClient, events
 from telethon.errors import SessionPasswordNeededError
 
+# Guarded import: uvloop is optional (not available on Windows)
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
 from app.config import TelegramSourceConfig
 from app.logging_config import get_logger
-from app.parsers.pocketoption import PocketOptionParser
+from app.parsers.pocketoption import parse as parse_pocketoption
 from app.clients.pocketoption_bot_client import PocketOptionBotClient
 
 logger = get_logger("telegram-source")
@@ -28,7 +35,6 @@ class TelegramSourceService:
         """
         self.config = config
         self.client: Optional[TelegramClient] = None
-        self.parser = PocketOptionParser()
         self.bot_client = PocketOptionBotClient(config)
         self._running = False
     
@@ -84,43 +90,40 @@ class TelegramSourceService:
             async def handle_new_message(event: events.NewMessage.Event) -> None:
                 """Handle new messages from the PocketOption channel."""
                 message = event.message
-                # Get raw message text
-                raw_text = message.text or "(no text)"
-                
-                logger.info(
-                    "Received new message",
-                    extra={
-                        "message_id": message.id,
-                        "channel_id": message.chat_id,
-                        "raw_text": raw_text[:200],  # First 200 chars for debugging
-                    }
-                )
                 
                 # Parse message
-                signal = self.parser.parse(message)
+                signal = parse_pocketoption(message)
                 
                 if signal is None:
                     logger.warning(
                         "Failed to parse message as PocketOption signal",
-                        extra={"message_id": message.id}
+                        extra={
+                            "message_id": message.id,
+                            "raw_text": (message.text or "(no text)")[:200],
+                        }
                     )
                     return
                 
-                # Log structured signal
-                logger.info(
-                    "Parsed PocketOption signal",
-                    extra={
-                        "signal_type": signal.signal_type.value,
-                        "asset": signal.asset,
-                        "duration_minutes": signal.duration_minutes,
-                        "direction": signal.direction.value if signal.direction else None,
-                        "amount_multiplier": signal.amount_multiplier,
-                        "message_id": message.id,
-                        "raw_text": signal.raw_text[:200],  # First 200 chars for debugging
-                    }
-                )
+                # Log structured signal (one record per message; skip building it when INFO is off)
+                if logger.isEnabledFor(logging.INFO):
+                    logger.info(
+                        "Parsed PocketOption signal",
+                        extra={
+                            "signal_type": signal.signal_type,
+                            "asset": signal.asset,
+                            "duration_minutes": signal.duration_minutes,
+                            "direction": signal.direction,
+                            "amount_multiplier": signal.amount_multiplier,
+                            "message_id": message.id,
+                            "channel_id": message.chat_id,
+                            "raw_text": signal.raw_text[:200],  # First 200 chars for debugging
+                        }
+                    )
                 
-                # Send to PocketOption bot (or DRY-RUN)
+                # Send to PocketOption bot (or DRY-RUN). This only enqueues the
+                # signal: the bot client's bounded queue and single sender task
+                # decouple Telegram dispatch from bot latency while keeping
+                # signals in order, so no per-message task is spawned here.
                 await self.bot_client.place_trade(signal)
             
             logger.info(
@@ -145,6 +148,7 @@ class TelegramSourceService:
         if self.client:
             await self.client.disconnect()
             logger.info("Telegram client disconnected")
+        await self.bot_client.aclose()
         self._running = False
     
     async def stop(self) -> None:
@@ -165,13 +169,23 @@ async def main() -> None:
     
     service = TelegramSourceService(config)
     
-    # Handle graceful shutdown
-    def signal_handler(signum, frame):
+    # Handle graceful shutdown: signals are delivered on the loop thread, and
+    # repeated signals do not start more than one stop
+    stop_task: Optional[asyncio.Task] = None
+    
+    def request_stop(signum: int) -> None:
+        nonlocal stop_task
         logger.info(f"Received signal {signum}, shutting down...")
-        asyncio.create_task(service.stop())
+        if stop_task is None:
+            stop_task = asyncio.create_task(service.stop())
     
-    signal.signal(signal.SIGINT, signal_handler)
-    signal.signal(signal.SIGTERM, signal_handler)
+    loop = asyncio.get_running_loop()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(signum, request_stop, signum)
+        except NotImplementedError:
+            # Windows: no loop signal handlers; Ctrl+C raises KeyboardInterrupt
+            pass
     
     try:
         await service.start()
@@ -183,6 +197,9 @@ async def main() -> None:
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    if uvloop is not None:
+        uvloop.run(main())
+    else:
+        asyncio.run(main())
 
 
@@ -1,19 +1,19 @@
 """PocketOption signal model definitions."""
 
 from dataclasses import dataclass
-from enum import Enum
+from enum import StrEnum
 from typing import Optional
 
 
-class PocketOptionSignalType(str, Enum):
-    """PocketOption signal type."""
+class PocketOptionSignalType(StrEnum):
+    """PocketOption signal type (str() and format() give the plain value)."""
     PREPARE = "PREPARE"
     ENTRY = "ENTRY"
     REPEAT_X2 = "REPEAT_X2"
 
 
-class PocketOptionDirection(str, Enum):
-    """PocketOption trade direction."""
+class PocketOptionDirection(StrEnum):
+    """PocketOption trade direction (str() and format() give the plain value)."""
     CALL = "CALL"
     PUT = "PUT"
     UP = "UP"
@@ -24,15 +24,16 @@ class PocketOptionDirection(str, Enum):
     @classmethod
     def from_lower_higher(cls, text: str) -> Optional["PocketOptionDirection"]:
         """Map LOWER/HIGHER to DOWN/UP."""
-        text_upper = text.upper().strip()
-        if text_upper == "LOWER":
-            return cls.DOWN
-        elif text_upper == "HIGHER":
-            return cls.UP
-        return None
+        return _LOWER_HIGHER_MAP.get(text.strip().upper())
 
 
-@dataclass
+_LOWER_HIGHER_MAP = {
+    "LOWER": PocketOptionDirection.DOWN,
+    "HIGHER": PocketOptionDirection.UP,
+}
+
+
+@dataclass(slots=True, frozen=True)
 class PocketOptionSignal:
     """Parsed PocketOption signal from Telegram message."""
     signal_type: PocketOptionSignalType
@@ -1,10 +1,19 @@
 """PocketOption message parser."""
 
+import logging
 import re
-from typing import Optional
+from functools import lru_cache
+from typing import NamedTuple, Optional, Tuple, Union
 
 from telethon.tl.custom.message import Message
 
+# Guarded import: google-re2 is optional; when installed, the signal patterns
+# run on its linear-time engine instead of the backtracking re module
+try:
+    import re2
+except ImportError:
+    re2 = None
+
 from app.models.pocketoption import (
     PocketOptionDirection,
     PocketOptionSignal,
@@ -15,90 +24,110 @@ from app.logging_config import get_logger
 
 logger = get_logger("pocketoption-parser")
 
+# Distinct message texts whose classification is remembered
+_CLASSIFY_CACHE_SIZE = 1024
+
+# (signal_type, asset, duration_minutes, direction, amount_multiplier)
+_Classification = Tuple[
+    PocketOptionSignalType,
+    Optional[str],
+    Optional[int],
+    Optional[PocketOptionDirection],
+    Optional[float],
+]
+
+
+class _Rejected(NamedTuple):
+    """A near-miss found by _classify; parse() logs it with the message id."""
+    
+    reason: str
+    level: int = logging.WARNING
+    details: Tuple[Tuple[str, str], ...] = ()
+
+
+def _compile_signal_pattern(pattern: str):
+    """
+    Compile a signal pattern with re2 if available, otherwise with re.
+    
+    Flags are given inline ((?i), (?s)) since both engines accept them.
+    """
+    if re2 is not None:
+        try:
+            return re2.compile(pattern)
+        except re2.error:
+            pass
+    return re.compile(pattern)
+
 
 class PocketOptionParser(BaseParser):
     """Parser for PocketOption signal messages."""
     
     # Compiled regex patterns for performance
     # Handle markdown formatting (**, __, etc.) by stripping them
-    PREPARE_PATTERN = re.compile(r"^.*?Prepare a currency\s+(?P<asset>.+?)(?:\s*\*+)?$", re.IGNORECASE)
-    ENTRY_PATTERN = re.compile(r"^.*?(?P<asset>.+?)\s+(?P<duration>\d+)\s*min\s+(?P<direction>LOWER|HIGHER)\b.*$", re.IGNORECASE)
-    REPEAT_X2_PATTERN = re.compile(r"Repeat.*Amount\s*x\s*2", re.IGNORECASE | re.DOTALL)
-    PROFIT_PATTERN = re.compile(r"^.*?profit\s*👍", re.IGNORECASE)
-    LOSS_PATTERN = re.compile(r"^.*?loss\s*👎", re.IGNORECASE)
+    PREPARE_PATTERN = _compile_signal_pattern(r"(?i)^.*?Prepare a currency\s+(?P<asset>.+?)(?:\s*\*+)?$")
+    # No leading ^.*?: the lazy asset group already starts at the first character,
+    # and the extra prefix made failed matches cubic in the text length
+    ENTRY_PATTERN = _compile_signal_pattern(r"(?i)^(?P<asset>.+?)\s+(?P<duration>\d+)\s*min\s+(?P<direction>LOWER|HIGHER)\b.*$")
+    REPEAT_X2_PATTERN = _compile_signal_pattern(r"(?is)Repeat.*Amount\s*x\s*2")
+    PROFIT_PATTERN = _compile_signal_pattern(r"(?i)^.*?profit\s*👍")
+    LOSS_PATTERN = _compile_signal_pattern(r"(?i)^.*?loss\s*👎")
+    MARKDOWN_PATTERN = re.compile(r"[*_]+")
     
-    @staticmethod
-    def _strip_markdown(text: str) -> str:
+    @classmethod
+    def _strip_markdown(cls, text: str) -> str:
         """Remove markdown formatting from text."""
-        # Remove **, __, *, _ from anywhere
-        text = re.sub(r'\*\*+', '', text)
-        text = re.sub(r'__+', '', text)
-        text = re.sub(r'\*+', '', text)
-        text = re.sub(r'_+', '', text)
-        return text.strip()
+        # Remove **, __, *, _ from anywhere in a single pass
+        return cls.MARKDOWN_PATTERN.sub("", text).strip()
     
-    def parse(self, message: Message) -> Optional[PocketOptionSignal]:
+    @classmethod
+    @lru_cache(maxsize=_CLASSIFY_CACHE_SIZE)
+    def _classify(cls, text: str) -> Union[_Classification, _Rejected, None]:
         """
-        Parse a Telegram message into a PocketOptionSignal.
+        Classify stripped message text (cached: a pure function of the text).
         
-        Supported patterns:
-        1. PREPARE: "Prepare a currency GBP/USD OTC"
-        2. ENTRY: "GBP/USD OTC 5 min LOWER 📉"
-        3. REPEAT_X2: "🏪 Repeat/ Amount x2\nExpiration & Direction same"
-        4. Profit/loss messages are ignored (return None)
-        5. Other messages are ignored (return None)
+        Nothing is logged here, so a cached result still gets its log records
+        (with the message id) from parse() on every repeat.
         
         Args:
-            message: Telethon message object
+            text: Message text with surrounding whitespace removed
             
         Returns:
-            PocketOptionSignal if parsing succeeds, None otherwise
+            (signal_type, asset, duration_minutes, direction, amount_multiplier),
+            a _Rejected near-miss to log, or None if the text is not a signal
         """
-        if not message.text:
-            logger.debug("Message has no text content", extra={"message_id": message.id})
-            return None
-        
-        text = message.text.strip()
-        logger.debug("Parsing message", extra={"message_id": message.id, "text_preview": text[:100]})
-        
         # Normalize text by stripping markdown for pattern matching
-        normalized_text = self._strip_markdown(text)
+        normalized_text = cls._strip_markdown(text)
         
-        # Check for profit/loss messages first (ignore these)
-        if self.PROFIT_PATTERN.match(normalized_text) or self.LOSS_PATTERN.match(normalized_text):
-            logger.debug("Ignoring profit/loss message", extra={"message_id": message.id})
+        # Each signal pattern needs its keyword(s), so only patterns whose keywords
+        # occur are tried ("min" is not whole-word: "5min LOWER" is valid).
+        # Most channel chatter has none and is rejected here.
+        lowered = normalized_text.lower()
+        has_prepare = "prepare" in lowered
+        has_min = "min" in lowered
+        has_repeat_x2 = "repeat" in lowered and "amount" in lowered
+        if not (has_prepare or has_min or has_repeat_x2):
             return None
         
+        # Check for profit/loss messages first (ignore these); a substring test
+        # decides for nearly all texts, so the patterns rarely run
+        if ("profit" in lowered and cls.PROFIT_PATTERN.match(normalized_text)) or (
+            "loss" in lowered and cls.LOSS_PATTERN.match(normalized_text)
+        ):
+            return _Rejected("Ignoring profit/loss message", logging.DEBUG)
+        
         # Try PREPARE pattern (use normalized text for matching)
-        prepare_match = self.PREPARE_PATTERN.match(normalized_text)
+        prepare_match = has_prepare and cls.PREPARE_PATTERN.match(normalized_text)
         if prepare_match:
-            asset = self._strip_markdown(prepare_match.group("asset"))
-            logger.info(
-                "Parsed PREPARE signal",
-                extra={"message_id": message.id, "asset": asset}
-            )
-            return PocketOptionSignal(
-                signal_type=PocketOptionSignalType.PREPARE,
-                asset=asset,
-                duration_minutes=None,
-                direction=None,
-                amount_multiplier=None,
-                raw_message_id=message.id,
-                raw_channel_id=message.chat_id if message.chat_id else 0,
-                raw_text=text,
-            )
+            asset = cls._strip_markdown(prepare_match.group("asset"))
+            return (PocketOptionSignalType.PREPARE, asset, None, None, None)
         
         # Try ENTRY pattern (use normalized text for matching)
-        entry_match = self.ENTRY_PATTERN.match(normalized_text)
+        entry_match = has_min and cls.ENTRY_PATTERN.match(normalized_text)
         if entry_match:
             try:
-                asset = self._strip_markdown(entry_match.group("asset"))
+                asset = cls._strip_markdown(entry_match.group("asset"))
                 if not asset or not asset.strip():
-                    logger.warning(
-                        "Failed to parse asset from message",
-                        extra={"message_id": message.id, "text_preview": text[:100]}
-                    )
-                    return None
+                    return _Rejected("Failed to parse asset from message")
                 
                 duration_str = entry_match.group("duration")
                 direction_str = entry_match.group("direction").upper()
@@ -106,61 +135,98 @@ class PocketOptionParser(BaseParser):
                 try:
                     duration_minutes = int(duration_str)
                 except ValueError:
-                    logger.warning(
-                        "Failed to parse duration",
-                        extra={"message_id": message.id, "duration": duration_str}
-                    )
-                    return None
+                    return _Rejected("Failed to parse duration", details=(("duration", duration_str),))
                 
                 # Map LOWER/HIGHER to direction enum
                 direction = PocketOptionDirection.from_lower_higher(direction_str)
                 if direction is None:
-                    logger.warning(
-                        "Invalid direction value",
-                        extra={"message_id": message.id, "direction": direction_str}
-                    )
-                    return None
+                    return _Rejected("Invalid direction value", details=(("direction", direction_str),))
             except (IndexError, AttributeError) as e:
-                logger.warning(
-                    "Failed to parse asset from message",
-                    extra={"message_id": message.id, "text_preview": text[:100], "error": str(e)}
-                )
-                return None
+                return _Rejected("Failed to parse asset from message", details=(("error", str(e)),))
             
-            logger.info(
-                "Parsed ENTRY signal",
-                extra={
-                    "message_id": message.id,
-                    "asset": asset,
-                    "duration_minutes": duration_minutes,
-                    "direction": direction.value,
-                }
-            )
-            return PocketOptionSignal(
-                signal_type=PocketOptionSignalType.ENTRY,
-                asset=asset,
-                duration_minutes=duration_minutes,
-                direction=direction,
-                amount_multiplier=None,
-                raw_message_id=message.id,
-                raw_channel_id=message.chat_id if message.chat_id else 0,
-                raw_text=text,
-            )
+            return (PocketOptionSignalType.ENTRY, asset, duration_minutes, direction, None)
         
         # Try REPEAT_X2 pattern (use original text, markdown doesn't affect this pattern)
-        if self.REPEAT_X2_PATTERN.search(text):
-            logger.info("Parsed REPEAT_X2 signal", extra={"message_id": message.id})
-            return PocketOptionSignal(
-                signal_type=PocketOptionSignalType.REPEAT_X2,
-                asset=None,
-                duration_minutes=None,
-                direction=None,
-                amount_multiplier=2.0,
-                raw_message_id=message.id,
-                raw_channel_id=message.chat_id if message.chat_id else 0,
-                raw_text=text,
-            )
+        if has_repeat_x2 and cls.REPEAT_X2_PATTERN.search(text):
+            return (PocketOptionSignalType.REPEAT_X2, None, None, None, 2.0)
         
-        # All other messages are ignored
-        logger.debug("Ignoring message (no matching pattern)", extra={"message_id": message.id})
         return None
+    
+    def parse(self, message: Message) -> Optional[PocketOptionSignal]:
+        """
+        Parse a Telegram message into a PocketOptionSignal.
+        
+        Supported patterns:
+        1. PREPARE: "Prepare a currency GBP/USD OTC"
+        2. ENTRY: "GBP/USD OTC 5 min LOWER 📉"
+        3. REPEAT_X2: "🏪 Repeat/ Amount x2\nExpiration & Direction same"
+        4. Profit/loss messages are ignored (return None)
+        5. Other messages are ignored (return None)
+        
+        Repeated texts (channels re-post the same signals) are classified once;
+        see _classify.cache_info() for hit/miss counts.
+        
+        Args:
+            message: Telethon message object
+            
+        Returns:
+            PocketOptionSignal if parsing succeeds, None otherwise
+        """
+        if not message.text:
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Message has no text content", extra={"message_id": message.id})
+            return None
+        
+        text = message.text.strip()
+        # Checked per call (not at import) so a later log level change applies;
+        # skips the extra dicts and the preview slice when DEBUG is off
+        debug = logger.isEnabledFor(logging.DEBUG)
+        if debug:
+            logger.debug("Parsing message", extra={"message_id": message.id, "text_preview": text[:100]})
+        
+        classification = self._classify(text)
+        if classification is None:
+            # All other messages are ignored
+            if debug:
+                logger.debug("Ignoring message (no matching pattern)", extra={"message_id": message.id})
+            return None
+        if isinstance(classification, _Rejected):
+            if logger.isEnabledFor(classification.level):
+                logger.log(
+                    classification.level,
+                    classification.reason,
+                    extra={"message_id": message.id, "text_preview": text[:100], **dict(classification.details)},
+                )
+            return None
+        
+        signal_type, asset, duration_minutes, direction, amount_multiplier = classification
+        logger.info(
+            "Parsed %s signal",
+            signal_type,
+            extra={
+                "message_id": message.id,
+                "asset": asset,
+                "duration_minutes": duration_minutes,
+                "direction": direction,
+            }
+        )
+        return PocketOptionSignal(
+            signal_type=signal_type,
+            asset=asset,
+            duration_minutes=duration_minutes,
+            direction=direction,
+            amount_multiplier=amount_multiplier,
+            raw_message_id=message.id,
+            raw_channel_id=message.chat_id if message.chat_id else 0,
+            raw_text=text,
+        )
+
+
+# The parser is stateless (patterns and cache live on the class), so one
+# shared instance serves every caller
+DEFAULT_PARSER = PocketOptionParser()
+
+
+def parse(message: Message) -> Optional[PocketOptionSignal]:
+    """Parse a Telegram message with the shared PocketOptionParser."""
+    return DEFAULT_PARSER.parse(message)
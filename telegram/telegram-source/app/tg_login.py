@@ -4,6 +4,7 @@ import asyncio
 import os
 import sys
 from pathlib import Path
+from typing import Optional
 
 from telethon import TelegramClient
 from telethon.errors import SessionPasswordNeededError
@@ -38,14 +39,29 @@ def load_config_for_login():
     }
 
 
-async def login() -> None:
-    """Interactive login flow to create/refresh Telegram session."""
-    try:
-        config = load_config_for_login()
-    except ValueError as e:
-        print(f"Configuration error: {e}", file=sys.stderr)
-        logger.error("Configuration error", extra={"error": str(e)})
-        sys.exit(1)
+async def _prompt(prompt: str) -> str:
+    """Read a stripped line from stdin without blocking the event loop."""
+    return (await asyncio.to_thread(input, prompt)).strip()
+
+
+async def login(config: Optional[dict] = None) -> None:
+    """
+    Interactive login flow to create/refresh Telegram session.
+    
+    Prompts are read in a worker thread, so the Telegram connection (and any
+    other coroutine on the loop) keeps running while waiting for input.
+    
+    Args:
+        config: Login config as returned by load_config_for_login(); loaded
+            from the environment if omitted
+    """
+    if config is None:
+        try:
+            config = load_config_for_login()
+        except ValueError as e:
+            print(f"Configuration error: {e}", file=sys.stderr)
+            logger.error("Configuration error", extra={"error": str(e)})
+            sys.exit(1)
     
     # Ensure session directory exists
     config["session_file"].parent.mkdir(parents=True, exist_ok=True)
@@ -64,7 +80,7 @@ async def login() -> None:
             print("Not authorized. Starting login flow...")
             
             # Request phone number
-            phone = input("Enter your phone number (with country code, e.g., +1234567890): ").strip()
+            phone = await _prompt("Enter your phone number (with country code, e.g., +1234567890): ")
             if not phone:
                 print("Error: Phone number is required", file=sys.stderr)
                 sys.exit(1)
@@ -74,7 +90,7 @@ async def login() -> None:
             await client.send_code_request(phone)
             
             # Request code
-            code = input("Enter the login code you received: ").strip()
+            code = await _prompt("Enter the login code you received: ")
             if not code:
                 print("Error: Login code is required", file=sys.stderr)
                 sys.exit(1)
@@ -85,7 +101,7 @@ async def login() -> None:
                 print("Login successful!")
             except SessionPasswordNeededError:
                 # 2FA required
-                password = input("Enter your 2FA password: ").strip()
+                password = await _prompt("Enter your 2FA password: ")
                 if not password:
                     print("Error: 2FA password is required", file=sys.stderr)
                     sys.exit(1)
@@ -0,0 +1,73 @@
+"""Tests for telegram-source configuration."""
+
+from pathlib import Path
+
+import pytest
+
+from app.config import TelegramSourceConfig
+
+
+@pytest.fixture
+def env(monkeypatch):
+    """Set the required environment variables."""
+    monkeypatch.setenv("TELEGRAM_API_ID", "12345")
+    monkeypatch.setenv("TELEGRAM_API_HASH", "hash")
+    monkeypatch.setenv("TELEGRAM_ACCOUNT_ID", "ta01")
+    monkeypatch.setenv("TELEGRAM_POCKETOPTION_CHANNEL_ID", "-1002019935922")
+    monkeypatch.setenv("TELEGRAM_SESSION_DIR", "/tmp/sessions")
+    return monkeypatch
+
+
+def test_from_env_parses_values(env):
+    """Test that from_env coerces IDs and paths."""
+    config = TelegramSourceConfig.from_env()
+    
+    assert config.api_id == 12345
+    assert config.pocketoption_channel_id == -1002019935922
+    assert config.session_file == Path("/tmp/sessions/session_ta01.session")
+    assert config.dry_run is True
+
+
+def test_from_env_sees_environment_changes(env):
+    """Test that from_env re-reads the environment on every call."""
+    assert TelegramSourceConfig.from_env().account_id == "ta01"
+    
+    env.setenv("TELEGRAM_ACCOUNT_ID", "ta02")
+    
+    assert TelegramSourceConfig.from_env().account_id == "ta02"
+
+
+def test_from_env_requires_api_id(env):
+    """Test that a missing TELEGRAM_API_ID is reported."""
+    env.delenv("TELEGRAM_API_ID")
+    
+    with pytest.raises(ValueError, match="TELEGRAM_API_ID"):
+        TelegramSourceConfig.from_env()
+
+
+def test_from_env_rejects_non_numeric_batch_max(env):
+    """Test that a malformed integer setting is reported as a configuration error."""
+    env.setenv("POCKETOPTION_BOT_BATCH_MAX", "many")
+    
+    with pytest.raises(ValueError, match="bot_batch_max"):
+        TelegramSourceConfig.from_env()
+
+
+def test_direct_construction_coerces_and_validates():
+    """Test that string IDs/paths are coerced and wrong types are rejected."""
+    config = TelegramSourceConfig(
+        api_id="12345",
+        api_hash="hash",
+        account_id="ta01",
+        pocketoption_channel_id="-1002019935922",
+        session_dir="/tmp/sessions",
+    )
+    
+    assert config.api_id == 12345
+    assert config.pocketoption_channel_id == -1002019935922
+    assert config.session_file == Path("/tmp/sessions/session_ta01.session")
+    
+    with pytest.raises(ValueError, match="api_hash"):
+        TelegramSourceConfig(
+            api_id=12345, api_hash=None, account_id="ta01", pocketoption_channel_id="@channel"
+        )
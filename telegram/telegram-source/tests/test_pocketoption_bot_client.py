@@ -0,0 +1,269 @@
+"""Tests for PocketOption bot HTTP client."""
+
+import asyncio
+import dataclasses
+import json
+from unittest.mock import AsyncMock, patch
+
+import httpx
+import pytest
+
+from app.clients.pocketoption_bot_client import PocketOptionBotClient
+from app.config import TelegramSourceConfig
+from app.models.pocketoption import PocketOptionDirection, PocketOptionSignal, PocketOptionSignalType
+
+
+def _make_config(**overrides) -> TelegramSourceConfig:
+    values = {
+        "api_id": 1,
+        "api_hash": "hash",
+        "account_id": "ta01",
+        "pocketoption_channel_id": -1002019935922,
+        "pocketoption_bot_url": "http://pocketoption-bot:8080/",
+        "dry_run": False,
+    }
+    values.update(overrides)
+    return TelegramSourceConfig(**values)
+
+
+def _make_signal() -> PocketOptionSignal:
+    return PocketOptionSignal(
+        signal_type=PocketOptionSignalType.ENTRY,
+        asset="GBP/USD OTC",
+        duration_minutes=5,
+        direction=PocketOptionDirection.DOWN,
+        raw_message_id=12345,
+        raw_channel_id=-1002019935922,
+        raw_text="GBP/USD OTC 5 min LOWER",
+    )
+
+
+def _use_transport(bot_client: PocketOptionBotClient, handler) -> None:
+    """Create the client's pooled HTTP client on a mock transport."""
+    with patch(
+        "app.clients.pocketoption_bot_client.httpx.AsyncHTTPTransport",
+        return_value=httpx.MockTransport(handler),
+    ):
+        bot_client._get_client()
+
+
+@pytest.mark.asyncio
+async def test_place_trade_reuses_single_client():
+    """Test that consecutive signals are posted through one pooled client."""
+    requests = []
+    
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(200, json={"status": "accepted"})
+    
+    bot_client = PocketOptionBotClient(_make_config())
+    _use_transport(bot_client, handler)
+    shared = bot_client._client
+    await bot_client.place_trade(_make_signal())
+    await bot_client._queue.join()
+    await bot_client.place_trade(_make_signal())
+    assert bot_client._client is shared
+    await bot_client.aclose()
+    assert bot_client._client is None
+    
+    assert len(requests) == 2
+    assert str(requests[0].url) == "http://pocketoption-bot:8080/place_trade"
+    assert requests[0].headers["content-type"] == "application/json"
+    payload = json.loads(requests[0].content)
+    assert payload["signal_type"] == "ENTRY"
+    assert payload["direction"] == "DOWN"
+    assert payload["raw_message_id"] == 12345
+    assert payload["amount_multiplier"] is None
+    assert list(payload) == [
+        "signal_type",
+        "asset",
+        "duration_minutes",
+        "direction",
+        "amount_multiplier",
+        "raw_message_id",
+        "raw_channel_id",
+        "raw_text",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_client_context_manager_closes_pool():
+    """Test that leaving the async context flushes the queue and closes the client."""
+    requests = []
+    
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(200, json={"status": "accepted"})
+    
+    async with PocketOptionBotClient(_make_config()) as bot_client:
+        _use_transport(bot_client, handler)
+        await bot_client.place_trade(_make_signal())
+    
+    assert bot_client._client is None
+    assert len(requests) == 1
+
+
+@pytest.mark.asyncio
+async def test_place_trade_dry_run_skips_http():
+    """Test that DRY-RUN never creates an HTTP client."""
+    bot_client = PocketOptionBotClient(_make_config(dry_run=True))
+    
+    await bot_client.place_trade(_make_signal())
+    
+    assert bot_client._client is None
+
+
+@pytest.mark.asyncio
+async def test_place_trade_does_not_wait_for_bot_response():
+    """Test that place_trade returns once queued and aclose flushes the queue."""
+    requests = []
+    release = asyncio.Event()
+    
+    async def handler(request: httpx.Request) -> httpx.Response:
+        await release.wait()
+        requests.append(request)
+        return httpx.Response(200, json={"status": "accepted"})
+    
+    bot_client = PocketOptionBotClient(_make_config())
+    _use_transport(bot_client, handler)
+    await asyncio.wait_for(bot_client.place_trade(_make_signal()), timeout=1)
+    await asyncio.sleep(0.05)  # let the first signal go out on its own
+    await asyncio.wait_for(bot_client.place_trade(_make_signal()), timeout=1)
+    assert requests == []
+    release.set()
+    await bot_client.aclose()
+    
+    assert bot_client._worker is None
+    assert len(requests) == 2
+
+
+@pytest.mark.asyncio
+async def test_queued_signals_are_sent_as_one_batch():
+    """Test that signals queued within the window are coalesced into one batch POST."""
+    requests = []
+    
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(
+            200,
+            json=[
+                {"status": "accepted", "reason": None, "dry_run": True, "enabled": True},
+                {"status": "error", "reason": "UI disabled", "dry_run": True, "enabled": True},
+                {"status": "skipped", "reason": None, "dry_run": True, "enabled": True},
+            ],
+        )
+    
+    bot_client = PocketOptionBotClient(_make_config(bot_batch_max=3))
+    _use_transport(bot_client, handler)
+    for _ in range(4):
+        await bot_client.place_trade(_make_signal())
+    await bot_client.aclose()
+    
+    assert [str(request.url) for request in requests] == [
+        "http://pocketoption-bot:8080/place_trade_batch",
+        "http://pocketoption-bot:8080/place_trade",
+    ]
+    batch = json.loads(requests[0].content)
+    assert len(batch) == 3
+    assert batch[0]["signal_type"] == "ENTRY"
+    # The bot runs a batch sequentially: its timeout scales with the batch size
+    assert requests[0].extensions["timeout"]["read"] == 15.0
+    assert requests[1].extensions["timeout"]["read"] == 5.0
+
+
+@pytest.mark.asyncio
+async def test_oversized_batch_falls_back_to_single_posts():
+    """Test that a batch refused with 413 is re-sent signal by signal."""
+    requests = []
+    
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        if request.url.path == "/place_trade_batch":
+            return httpx.Response(413, json={"detail": "Batch too large"})
+        return httpx.Response(200, json={"status": "accepted"})
+    
+    bot_client = PocketOptionBotClient(_make_config(bot_batch_max=2))
+    _use_transport(bot_client, handler)
+    for _ in range(2):
+        await bot_client.place_trade(_make_signal())
+    await bot_client.aclose()
+    
+    assert [request.url.path for request in requests] == [
+        "/place_trade_batch",
+        "/place_trade",
+        "/place_trade",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_place_trade_without_bot_url_skips_queue():
+    """Test that without a bot URL signals are only logged, never queued."""
+    bot_client = PocketOptionBotClient(_make_config(pocketoption_bot_url=None, dry_run=False))
+    
+    await bot_client.place_trade(_make_signal())
+    
+    assert bot_client._worker is None
+    assert bot_client._client is None
+
+
+@pytest.mark.asyncio
+async def test_place_trade_retries_gateway_errors():
+    """Test that 503 responses are retried and a later success is accepted."""
+    statuses = [503, 502, 200]
+    calls = []
+    
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        return httpx.Response(statuses[len(calls) - 1], json={})
+    
+    bot_client = PocketOptionBotClient(_make_config())
+    _use_transport(bot_client, handler)
+    with patch("app.clients.pocketoption_bot_client.asyncio.sleep", new=AsyncMock()) as sleep:
+        await bot_client.place_trade(_make_signal())
+        await bot_client.aclose()
+    
+    assert len(calls) == 3
+    assert sleep.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_place_trade_does_not_retry_client_errors():
+    """Test that non-gateway errors are not retried."""
+    calls = []
+    
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        return httpx.Response(400, json={"detail": "UI disabled"})
+    
+    bot_client = PocketOptionBotClient(_make_config())
+    _use_transport(bot_client, handler)
+    await bot_client.place_trade(_make_signal())
+    await bot_client.aclose()
+    
+    assert len(calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_place_trade_does_not_retry_gateway_timeout():
+    """Test that a 504 is not retried: the bot may already have placed the trade."""
+    calls = []
+    
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        return httpx.Response(504, json={})
+    
+    bot_client = PocketOptionBotClient(_make_config())
+    _use_transport(bot_client, handler)
+    await bot_client.place_trade(_make_signal())
+    await bot_client.aclose()
+    
+    assert len(calls) == 1
+
+
+def test_signal_is_immutable_and_hashable():
+    """Test that queued signals cannot be mutated and can be used as dedup keys."""
+    signal = _make_signal()
+    
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        signal.asset = "EUR/USD"
+    assert {signal, _make_signal()} == {signal}
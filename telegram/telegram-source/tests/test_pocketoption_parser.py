@@ -1,195 +1,241 @@
-"""Tests for PocketOption message parser."""
+"""
+Tests for PocketOption message parser.
+
+pytest's cache provider is on by default, so while iterating on the parser
+`pytest --lf` re-runs only the tests that failed last time (`--ff` runs them
+first, then the rest).
+"""
+
+from dataclasses import dataclass
+from typing import Optional
+from unittest.mock import patch
 
 import pytest
-from unittest.mock import Mock
 
 from app.models.pocketoption import PocketOptionDirection, PocketOptionSignalType
-from app.parsers.pocketoption import PocketOptionParser
+from app.parsers.pocketoption import DEFAULT_PARSER, PocketOptionParser, parse
+
+PREPARE = PocketOptionSignalType.PREPARE
+ENTRY = PocketOptionSignalType.ENTRY
+REPEAT_X2 = PocketOptionSignalType.REPEAT_X2
+UP = PocketOptionDirection.UP
+DOWN = PocketOptionDirection.DOWN
 
 
+@dataclass(slots=True, frozen=True)
 class MockMessage:
     """Mock Telethon message for testing."""
-    
-    def __init__(self, text: str, message_id: int = 12345, chat_id: int = -1001234567890):
-        self.text = text
-        self.id = message_id
-        self.chat_id = chat_id
+    text: Optional[str]
+    id: int = 12345
+    chat_id: int = -1001234567890
 
 
-def test_parse_prepare_signal():
-    """Test parsing a PREPARE signal message."""
-    parser = PocketOptionParser()
-    
-    message_text = "Prepare a currency GBP/USD OTC"
-    message = MockMessage(message_text)
-    signal = parser.parse(message)
-    
-    assert signal is not None
-    assert signal.signal_type == PocketOptionSignalType.PREPARE
-    assert signal.asset == "GBP/USD OTC"
-    assert signal.duration_minutes is None
-    assert signal.direction is None
-    assert signal.amount_multiplier is None
-    assert signal.raw_message_id == 12345
-    assert signal.raw_channel_id == -1001234567890
-    assert signal.raw_text == message_text
+# Fixed inputs, built once (MockMessage is frozen, so sharing them is safe)
+PREPARE_MSG = MockMessage("Prepare a currency GBP/USD OTC")
+ENTRY_LOWER_MSG = MockMessage("GBP/USD OTC 5 min LOWER 📉")
+ENTRY_HIGHER_MSG = MockMessage("EUR/USD 10 min HIGHER 📈")
+REPEAT_X2_MSG = MockMessage("🏪 Repeat/ Amount x2\nExpiration & Direction same")
+REPEAT_X2_SINGLE_LINE_MSG = MockMessage("Repeat/ Amount x2")
+PROFIT_MSG = MockMessage("profit 👍")
+LOSS_MSG = MockMessage("loss 👎")
+UNRELATED_MSG = MockMessage("This is a random message that doesn't match any pattern")
+EMPTY_MSG = MockMessage("")
+NO_TEXT_MSG = MockMessage(None)
 
 
-def test_parse_entry_signal_lower():
-    """Test parsing an ENTRY signal with LOWER direction."""
-    parser = PocketOptionParser()
-    
-    message_text = "GBP/USD OTC 5 min LOWER 📉"
-    message = MockMessage(message_text)
-    signal = parser.parse(message)
-    
-    assert signal is not None
-    assert signal.signal_type == PocketOptionSignalType.ENTRY
-    assert signal.asset == "GBP/USD OTC"
-    assert signal.duration_minutes == 5
-    assert signal.direction == PocketOptionDirection.DOWN
-    assert signal.amount_multiplier is None
-    assert signal.raw_message_id == 12345
-    assert signal.raw_channel_id == -1001234567890
-    assert signal.raw_text == message_text
+@pytest.fixture(scope="module")
+def parser():
+    """Share the service's parser across this module (it holds no per-message state)."""
+    return DEFAULT_PARSER
 
 
-def test_parse_entry_signal_higher():
-    """Test parsing an ENTRY signal with HIGHER direction."""
-    parser = PocketOptionParser()
-    
-    message_text = "EUR/USD 10 min HIGHER 📈"
-    message = MockMessage(message_text)
-    signal = parser.parse(message)
-    
+def _assert_signal(signal, **expected):
+    """Assert the signal was parsed and has the expected field values (one diff for all)."""
     assert signal is not None
-    assert signal.signal_type == PocketOptionSignalType.ENTRY
-    assert signal.asset == "EUR/USD"
-    assert signal.duration_minutes == 10
-    assert signal.direction == PocketOptionDirection.UP
-    assert signal.amount_multiplier is None
+    assert {field: getattr(signal, field) for field in expected} == expected
 
 
-def test_parse_repeat_x2_signal():
-    """Test parsing a REPEAT_X2 signal."""
-    parser = PocketOptionParser()
-    
-    message_text = """🏪 Repeat/ Amount x2
-Expiration & Direction same"""
-    message = MockMessage(message_text)
-    signal = parser.parse(message)
+def test_parse_prepare_signal(parser):
+    """Test parsing a PREPARE signal message."""
+    signal = parser.parse(PREPARE_MSG)
+    
+    _assert_signal(
+        signal,
+        signal_type=PREPARE,
+        asset="GBP/USD OTC",
+        duration_minutes=None,
+        direction=None,
+        amount_multiplier=None,
+        raw_message_id=12345,
+        raw_channel_id=-1001234567890,
+        raw_text=PREPARE_MSG.text,
+    )
+
+
+def test_parse_entry_signal_lower(parser):
+    """Test parsing an ENTRY signal with LOWER direction."""
+    signal = parser.parse(ENTRY_LOWER_MSG)
+    
+    _assert_signal(
+        signal,
+        signal_type=ENTRY,
+        asset="GBP/USD OTC",
+        duration_minutes=5,
+        direction=DOWN,
+        amount_multiplier=None,
+        raw_message_id=12345,
+        raw_channel_id=-1001234567890,
+        raw_text=ENTRY_LOWER_MSG.text,
+    )
+
+
+def test_parse_entry_signal_higher(parser):
+    """Test parsing an ENTRY signal with HIGHER direction."""
+    signal = parser.parse(ENTRY_HIGHER_MSG)
     
-    assert signal is not None
-    assert signal.signal_type == PocketOptionSignalType.REPEAT_X2
-    assert signal.amount_multiplier == 2.0
-    assert signal.asset is None
-    assert signal.duration_minutes is None
-    assert signal.direction is None
-    assert signal.raw_message_id == 12345
-    assert signal.raw_channel_id == -1001234567890
-    assert signal.raw_text == message_text
+    _assert_signal(
+        signal,
+        signal_type=ENTRY,
+        asset="EUR/USD",
+        duration_minutes=10,
+        direction=UP,
+        amount_multiplier=None,
+    )
 
 
-def test_parse_repeat_x2_single_line():
+def test_parse_repeat_x2_signal(parser):
+    """Test parsing a REPEAT_X2 signal."""
+    signal = parser.parse(REPEAT_X2_MSG)
+    
+    _assert_signal(
+        signal,
+        signal_type=REPEAT_X2,
+        asset=None,
+        duration_minutes=None,
+        direction=None,
+        amount_multiplier=2.0,
+        raw_message_id=12345,
+        raw_channel_id=-1001234567890,
+        raw_text=REPEAT_X2_MSG.text,
+    )
+
+
+def test_parse_repeat_x2_single_line(parser):
     """Test parsing a REPEAT_X2 signal in single line."""
-    parser = PocketOptionParser()
-    
-    message_text = "Repeat/ Amount x2"
-    message = MockMessage(message_text)
-    signal = parser.parse(message)
-    
-    assert signal is not None
-    assert signal.signal_type == PocketOptionSignalType.REPEAT_X2
-    assert signal.amount_multiplier == 2.0
-
-
-def test_parse_profit_message_ignored():
-    """Test that profit messages are ignored."""
-    parser = PocketOptionParser()
-    
-    message_text = "profit 👍"
-    message = MockMessage(message_text)
+    signal = parser.parse(REPEAT_X2_SINGLE_LINE_MSG)
+    
+    _assert_signal(
+        signal,
+        signal_type=REPEAT_X2,
+        amount_multiplier=2.0,
+    )
+
+
+@pytest.mark.parametrize(
+    "message",
+    [
+        PROFIT_MSG,
+        LOSS_MSG,
+        # Would otherwise match ENTRY: profit/loss results are checked first
+        MockMessage("profit 👍 EUR/USD 5 min HIGHER"),
+        UNRELATED_MSG,
+        EMPTY_MSG,
+        NO_TEXT_MSG,
+    ],
+    ids=["profit", "loss", "profit-with-entry-text", "unrelated", "empty", "no-text"],
+)
+def test_parse_ignored_messages(parser, message):
+    """Test that profit/loss, unrelated and text-less messages are ignored."""
+    assert parser.parse(message) is None
+
+
+_DURATION_CASES = (
+    ("GBP/USD 1 min LOWER", 1),
+    ("EUR/USD 5 min HIGHER", 5),
+    ("BTC/USD 10 min LOWER", 10),
+    ("ETH/USD 15 min HIGHER", 15),
+)
+
+_ASSET_CASES = (
+    ("GBP/USD OTC 5 min LOWER", "GBP/USD OTC"),
+    ("EUR/USD 5 min HIGHER", "EUR/USD"),
+    ("BTC/USD 5 min LOWER", "BTC/USD"),
+)
+
+# Messages built once at import; the case text doubles as the test id
+_DURATION_MESSAGES = tuple((MockMessage(text), duration) for text, duration in _DURATION_CASES)
+_ASSET_MESSAGES = tuple((MockMessage(text), asset) for text, asset in _ASSET_CASES)
+
+
+@pytest.mark.parametrize(
+    "message,expected_duration",
+    _DURATION_MESSAGES,
+    ids=[text for text, _ in _DURATION_CASES],
+)
+def test_parse_entry_different_durations(parser, message, expected_duration):
+    """Test parsing ENTRY signals with different durations."""
     signal = parser.parse(message)
     
-    assert signal is None
+    _assert_signal(
+        signal,
+        signal_type=ENTRY,
+        duration_minutes=expected_duration,
+    )
 
 
-def test_parse_loss_message_ignored():
-    """Test that loss messages are ignored."""
-    parser = PocketOptionParser()
-    
-    message_text = "loss 👎"
-    message = MockMessage(message_text)
+@pytest.mark.parametrize(
+    "message,expected_asset",
+    _ASSET_MESSAGES,
+    ids=[text for text, _ in _ASSET_CASES],
+)
+def test_parse_entry_different_assets(parser, message, expected_asset):
+    """Test parsing ENTRY signals with different asset formats."""
     signal = parser.parse(message)
     
-    assert signal is None
+    _assert_signal(signal, asset=expected_asset)
 
 
-def test_parse_unrelated_message_ignored():
-    """Test that unrelated messages are ignored."""
-    parser = PocketOptionParser()
+def test_parse_repeated_text_uses_cached_classification(parser):
+    """Test that a re-posted text is classified once but keeps per-message ids."""
+    PocketOptionParser._classify.cache_clear()
     
-    message_text = "This is a random message that doesn't match any pattern"
-    message = MockMessage(message_text)
-    signal = parser.parse(message)
+    first = parser.parse(MockMessage("EUR/USD 3 min HIGHER", id=1))
+    second = parser.parse(MockMessage("EUR/USD 3 min HIGHER", id=2))
     
-    assert signal is None
+    assert PocketOptionParser._classify.cache_info().hits == 1
+    _assert_signal(first, raw_message_id=1)
+    _assert_signal(second, raw_message_id=2, asset="EUR/USD", duration_minutes=3, direction=UP)
 
 
-def test_parse_empty_message():
-    """Test parsing fails for empty message."""
-    parser = PocketOptionParser()
+def test_parse_repeated_rejection_is_logged_per_message(parser):
+    """Test that a cached near-miss is still logged, with its own id, on every repeat."""
+    PocketOptionParser._classify.cache_clear()
     
-    message = MockMessage("")
-    signal = parser.parse(message)
+    with patch("app.parsers.pocketoption.logger") as logger:
+        parser.parse(MockMessage("profit 👍 5 min", id=1))
+        parser.parse(MockMessage("profit 👍 5 min", id=2))
     
-    assert signal is None
+    assert PocketOptionParser._classify.cache_info().hits == 1
+    assert [call.kwargs["extra"]["message_id"] for call in logger.log.call_args_list] == [1, 2]
 
 
-def test_parse_none_text():
-    """Test parsing fails when message has no text."""
-    parser = PocketOptionParser()
+def test_parse_long_near_miss_entry_text(parser):
+    """Test that long text that almost matches ENTRY is rejected without heavy backtracking."""
+    # Took seconds with a ^.*? prefix in front of the lazy asset group
+    message = MockMessage("GBP/USD 5 min " * 2000 + "soon")
     
-    message = MockMessage("")
-    message.text = None
-    signal = parser.parse(message)
-    
-    assert signal is None
+    assert parser.parse(message) is None
 
 
-def test_parse_entry_different_durations():
-    """Test parsing ENTRY signals with different durations."""
-    parser = PocketOptionParser()
-    
-    test_cases = [
-        ("GBP/USD 1 min LOWER", 1),
-        ("EUR/USD 5 min HIGHER", 5),
-        ("BTC/USD 10 min LOWER", 10),
-        ("ETH/USD 15 min HIGHER", 15),
-    ]
+def test_parse_prepare_signal_with_leading_emoji(parser):
+    """Test that PREPARE is recognized when the text does not start with the keyword."""
+    signal = parser.parse(MockMessage("🔔 Prepare a currency EUR/JPY OTC"))
     
-    for message_text, expected_duration in test_cases:
-        message = MockMessage(message_text)
-        signal = parser.parse(message)
-        
-        assert signal is not None, f"Failed to parse: {message_text}"
-        assert signal.signal_type == PocketOptionSignalType.ENTRY, f"Wrong type for: {message_text}"
-        assert signal.duration_minutes == expected_duration, f"Wrong duration for: {message_text}"
+    _assert_signal(signal, signal_type=PREPARE, asset="EUR/JPY OTC")
 
 
-def test_parse_entry_different_assets():
-    """Test parsing ENTRY signals with different asset formats."""
-    parser = PocketOptionParser()
-    
-    test_cases = [
-        ("GBP/USD OTC 5 min LOWER", "GBP/USD OTC"),
-        ("EUR/USD 5 min HIGHER", "EUR/USD"),
-        ("BTC/USD 5 min LOWER", "BTC/USD"),
-    ]
+def test_module_parse_uses_shared_parser():
+    """Test the module-level parse() helper used by the service."""
+    signal = parse(MockMessage("Prepare a currency AUD/CAD OTC"))
     
-    for message_text, expected_asset in test_cases:
-        message = MockMessage(message_text)
-        signal = parser.parse(message)
-        
-        assert signal is not None, f"Failed to parse: {message_text}"
-        assert signal.asset == expected_asset, f"Wrong asset for: {message_text}"
+    _assert_signal(signal, signal_type=PREPARE, asset="AUD/CAD OTC")
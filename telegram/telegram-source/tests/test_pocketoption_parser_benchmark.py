@@ -0,0 +1,46 @@
+"""
+Benchmarks for the PocketOption message parser.
+
+Opt-in: the repo pytest.ini deselects the benchmark marker, so plain runs
+skip this module. It also needs pytest-benchmark, which is not in
+requirements.txt (the module is skipped without it). To time the parser:
+
+    pip install pytest-benchmark
+    pytest -m benchmark --benchmark-only tests/test_pocketoption_parser_benchmark.py
+
+Add -p no:xdist if PYTEST_ADDOPTS enables parallel runs; pytest-benchmark
+does not time under xdist.
+"""
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+from app.parsers.pocketoption import DEFAULT_PARSER, PocketOptionParser
+from tests.test_pocketoption_parser import ENTRY_LOWER_MSG, PREPARE_MSG, UNRELATED_MSG
+
+
+@pytest.mark.benchmark(group="parse")
+def test_perf_prepare(benchmark):
+    """Benchmark parsing a PREPARE signal (cached classification)."""
+    assert benchmark(DEFAULT_PARSER.parse, PREPARE_MSG) is not None
+
+
+@pytest.mark.benchmark(group="parse")
+def test_perf_entry(benchmark):
+    """Benchmark parsing an ENTRY signal (cached classification)."""
+    assert benchmark(DEFAULT_PARSER.parse, ENTRY_LOWER_MSG) is not None
+
+
+@pytest.mark.benchmark(group="classify")
+def test_perf_classify_entry_uncached(benchmark):
+    """Benchmark classifying ENTRY text, bypassing the lru_cache."""
+    classify = PocketOptionParser._classify.__wrapped__
+    assert benchmark(classify, PocketOptionParser, ENTRY_LOWER_MSG.text) is not None
+
+
+@pytest.mark.benchmark(group="classify")
+def test_perf_classify_unrelated_uncached(benchmark):
+    """Benchmark rejecting non-signal text, bypassing the lru_cache."""
+    classify = PocketOptionParser._classify.__wrapped__
+    assert benchmark(classify, PocketOptionParser, UNRELATED_MSG.text) is None
@@ -0,0 +1,35 @@
+"""Property-based tests for the PocketOption message parser (requires hypothesis)."""
+
+import pytest
+
+pytest.importorskip("hypothesis")
+
+from hypothesis import given, settings, strategies as st
+
+from app.models.pocketoption import PocketOptionDirection, PocketOptionSignalType
+from app.parsers.pocketoption import DEFAULT_PARSER
+from tests.test_pocketoption_parser import MockMessage
+
+_EXPECTED_DIRECTION = {
+    "LOWER": PocketOptionDirection.DOWN,
+    "HIGHER": PocketOptionDirection.UP,
+}
+
+
+@settings(max_examples=50, deadline=None)
+@given(
+    asset=st.sampled_from(["GBP/USD", "EUR/USD", "BTC/USD", "ETH/USD", "GBP/USD OTC"]),
+    duration=st.integers(min_value=1, max_value=60),
+    direction=st.sampled_from(["LOWER", "HIGHER", "lower", "Higher"]),
+)
+def test_parse_generated_entry_signals(asset, duration, direction):
+    """Test that any "{asset} {duration} min {direction}" text parses as ENTRY."""
+    signal = DEFAULT_PARSER.parse(MockMessage(f"{asset} {duration} min {direction}"))
+    
+    assert signal is not None
+    assert (signal.signal_type, signal.asset, signal.duration_minutes, signal.direction) == (
+        PocketOptionSignalType.ENTRY,
+        asset,
+        duration,
+        _EXPECTED_DIRECTION[direction.upper()],
+    )